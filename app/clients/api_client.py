@@ -1,4 +1,10 @@
+from typing import Awaitable, Callable, Hashable, TypeVar
+
 from app.common.api_handlers.json_api_handler import AsyncJsonApiHandler
+from app.common.caching.geodata_cache import GeoDataCache
+from app.common.tracing.tracer import trace_span
+
+T = TypeVar("T")
 
 
 class ApiClient:
@@ -7,16 +13,47 @@ class ApiClient:
     This class provides methods to interact with the Urban API, specifically for retrieving project information.
     Attributes:
         api_handler (AsyncApiHandler): Instance of AsyncApiHandler for making API requests.
-        max_async_extractions (int): Maximum number of asynchronous extractions allowed. Defaults to 40.
+        Concurrency of requests is limited by the handler and shared by all clients of the same upstream.
+        cache (GeoDataCache | None): Cache for parsed upstream geodata. If None, data is always requested.
     """
 
-    def __init__(self, api_json_handler: AsyncJsonApiHandler, max_async_extractions: int = 40):
+    def __init__(self, api_json_handler: AsyncJsonApiHandler, cache: GeoDataCache | None = None):
         """
         Function initializes the UrbanApiClient with an AsyncJsonApiHandler instance.
         Args:
             api_json_handler (str): An instance of AsyncJsonApiHandler to handle API requests.
-            max_async_extractions (int): Maximum number of asynchronous extractions allowed. Defaults to 40.
+            cache (GeoDataCache | None): Cache for parsed upstream geodata. Defaults to None.
         """
 
         self.api_handler = api_json_handler
-        self.max_async_extractions: int = max_async_extractions
+        self.cache = cache
+
+    async def _cached(
+        self, source: str, key: tuple[Hashable, ...], token: str | None, fetch: Callable[[], Awaitable[T]]
+    ) -> T:
+        """
+        Function returns cached value for token or fetches it from api.
+        Args:
+            source (str): Data source name.
+            key (tuple[Hashable, ...]): Cache key, starting with entity name and id, e.g. ("scenario", 835).
+            token (str | None): User bearer access token.
+            fetch (Callable[[], Awaitable[T]]): Async function to fetch value on cache miss.
+        Returns:
+            T: Cached or fetched value.
+        """
+
+        fetched = False
+
+        async def fetch_and_mark() -> T:
+            nonlocal fetched
+            fetched = True
+            return await fetch()
+
+        with trace_span(f"{type(self).__name__} {source}", source=source, entity=key[0], entity_id=key[1]) as span:
+            if self.cache is None:
+                value = await fetch_and_mark()
+            else:
+                value = await self.cache.get_or_fetch(source, key, token, fetch_and_mark)
+            if span is not None:
+                span.set_attributes(cache_hit=not fetched)
+            return value
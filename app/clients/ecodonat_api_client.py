@@ -1,10 +1,12 @@
 from types import NoneType
 
 import geopandas as gpd
+import numpy as np
 from fastapi import HTTPException
 from loguru import logger
 
 from app.common.api_handlers.json_api_handler import AsyncJsonApiHandler
+from app.common.caching.geodata_cache import GeoDataCache
 from app.common.exceptions.http_exception import http_exception
 
 from .api_client import ApiClient
@@ -16,22 +18,54 @@ class EcodonutApiClient(ApiClient):
     This class provides methods to interact with the Ecodonut API.
     Attributes:
         api_handler (AsyncApiHandler): Instance of AsyncApiHandler for making API requests.
-        max_async_extractions (int): Maximum number of asynchronous extractions allowed. Defaults to 40.
+        cache (GeoDataCache | None): Cache for parsed slope polygons.
     """
 
-    def __init__(self, ecodonut_api_json_handler: AsyncJsonApiHandler, max_async_extractions: int = 40):
+    def __init__(self, ecodonut_api_json_handler: AsyncJsonApiHandler, cache: GeoDataCache | None = None):
         """
         Function initializes the UrbanApiClient with an AsyncJsonApiHandler instance.
         Args:
             ecodonut_api_json_handler (str): An instance of AsyncJsonApiHandler to handle API requests.
-            max_async_extractions (int): Maximum number of asynchronous extractions allowed. Defaults to 40.
+            cache (GeoDataCache | None): Cache for parsed slope polygons. Defaults to None.
         """
 
-        super().__init__(ecodonut_api_json_handler, max_async_extractions)
+        super().__init__(ecodonut_api_json_handler, cache)
+
+    @staticmethod
+    def sort_slope_polygons(slope_polygons: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+        """
+        Function sorts slope polygons by slope angle, dropping polygons without angle.
+        Args:
+            slope_polygons (gpd.GeoDataFrame): Slope polygons with "slope_deg" column.
+        Returns:
+            gpd.GeoDataFrame: Slope polygons sorted by ascending "slope_deg".
+        """
+
+        if "slope_deg" not in slope_polygons.columns:
+            return slope_polygons
+        slope_polygons = slope_polygons[slope_polygons["slope_deg"].notna()]
+        return slope_polygons.sort_values("slope_deg", kind="stable", ignore_index=True)
+
+    @staticmethod
+    def cut_slope_polygons(slope_polygons: gpd.GeoDataFrame, angle: int) -> gpd.GeoDataFrame:
+        """
+        Function selects slope polygons with equal or greater slope angle with binary search.
+        Args:
+            slope_polygons (gpd.GeoDataFrame): Slope polygons sorted by ascending "slope_deg".
+            angle (int): Minimum slope angle.
+        Returns:
+            gpd.GeoDataFrame: Slope polygons with "slope_deg" >= angle.
+        """
+
+        if "slope_deg" not in slope_polygons.columns:
+            return slope_polygons
+        start = np.searchsorted(slope_polygons["slope_deg"].to_numpy(dtype=float), angle, side="left")
+        return slope_polygons.iloc[start:]
 
     async def get_slope_polygons(self, token: str, project_id: int, angle: int | None = None) -> gpd.GeoDataFrame:
         """
         Function retrieves slope polygons from ecodonut api for gen planner.
+        Full set of project slope polygons is cached sorted by slope angle, so any angle is selected locally.
         Args:
             token (str): The API auth token.
             project_id (int): Target project ID.
@@ -45,12 +79,17 @@ class EcodonutApiClient(ApiClient):
 
         if isinstance(angle, NoneType):
             return gpd.GeoDataFrame()
-        response = await self.api_handler.get(
-            f"/ecodonut/{project_id}/slope_polygons",
-            headers={"Authorization": f"Bearer {token}"},
-        )
+
+        async def fetch_slope_polygons() -> gpd.GeoDataFrame:
+            response = await self.api_handler.get(
+                f"/ecodonut/{project_id}/slope_polygons",
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            return self.sort_slope_polygons(gpd.GeoDataFrame.from_features(response, crs=4326))
+
         try:
-            return gpd.GeoDataFrame.from_features(response, crs=4326).query(f"slope_deg >= {angle}")
+            slope_polygons = await self._cached("slope_polygons", ("project", project_id), token, fetch_slope_polygons)
+            return self.cut_slope_polygons(slope_polygons, angle)
         except HTTPException:
             raise
         except Exception as e:
@@ -1,11 +1,15 @@
 import asyncio
-from typing import Awaitable
+import re
+from typing import AsyncIterator, Awaitable
 
 import geopandas as gpd
 import pandas as pd
+from fastapi import HTTPException
+from loguru import logger
 from shapely.geometry import shape
 
 from app.common.api_handlers.json_api_handler import AsyncJsonApiHandler
+from app.common.caching.geodata_cache import GeoDataCache
 from app.common.exceptions.http_exception import http_exception
 
 from .api_client import ApiClient
@@ -17,18 +21,93 @@ class UrbanApiClient(ApiClient):
     This class provides methods to interact with the Urban API, specifically for retrieving project information.
     Attributes:
         api_json_handler – An instance of AsyncJsonApiHandler to handle API requests.
-        max_async_extractions – Maximum number of asynchronous extractions allowed. Defaults to 40.
+        multi_type_param – Query parameter name to filter physical objects by several types at once.
+        If None, physical objects are requested separately for each type.
+        cache – Cache for parsed territories, physical objects and functional zones.
     """
 
-    def __init__(self, urban_api_json_handler: AsyncJsonApiHandler, max_async_extractions: int = 40):
+    def __init__(
+        self,
+        urban_api_json_handler: AsyncJsonApiHandler,
+        multi_type_param: str | None = None,
+        cache: GeoDataCache | None = None,
+    ):
         """
         Function initializes the UrbanApiClient with an AsyncJsonApiHandler instance.
         Args:
             urban_api_json_handler (str): An instance of AsyncJsonApiHandler to handle API requests.
-            max_async_extractions (int): Maximum number of asynchronous extractions allowed. Defaults to 40.
+            multi_type_param (str | None): Query parameter name accepting comma separated physical object type IDs.
+            Defaults to None.
+            cache (GeoDataCache | None): Cache for parsed upstream geodata. Defaults to None.
+        """
+
+        super().__init__(urban_api_json_handler, cache)
+        self.multi_type_param = multi_type_param
+        self._multi_type_support: dict[str, bool] = {}
+
+    @staticmethod
+    def _features_to_gdf(result: dict) -> gpd.GeoDataFrame:
+        """
+        Function parses FeatureCollection response to GeoDataFrame
+        Args:
+            result (dict): FeatureCollection response.
+        Returns:
+            gpd.GeoDataFrame: GeoDataFrame with features in EPSG:4326.
+        Raises:
+            500, if response can not be parsed to GeoDataFrame.
+        """
+
+        try:
+            return gpd.GeoDataFrame.from_features(result, crs=4326)
+        except Exception as e:
+            raise http_exception(
+                500,
+                "Error during converting results to GeoDataFrame",
+                _input={"requests": "async requests"},
+                _detail={"error": repr(e)},
+            ) from e
+
+    async def _extract_request(self, request: Awaitable, as_gdf: bool) -> list | dict | gpd.GeoDataFrame | None:
+        """
+        Function awaits request and parses its result in thread, so parsing does not block requests in flight
+        Args:
+            request (Awaitable): async request function to be executed
+            as_gdf (bool): If True, returns gpd.GeoDataFrame object or None for empty FeatureCollection.
+        Returns:
+            list | dict | gpd.GeoDataFrame | None: request result
+        """
+
+        result = await request
+        if not as_gdf:
+            return result
+        if not result["features"]:
+            return None
+        return await asyncio.to_thread(self._features_to_gdf, result)
+
+    async def iter_several_requests(
+        self, requests: list[Awaitable], as_gdfs: bool = False
+    ) -> AsyncIterator[tuple[int, list | dict | gpd.GeoDataFrame | None]]:
         """
+        Function executes several requests asynchronously and yields results as soon as they are finished.
+        Concurrency is limited by the api handler semaphore, which is shared by all requests to the same upstream.
+        Args:
+            requests (list[Awaitable]): list of async request functions to be executed
+            as_gdfs (bool): If True, yields gpd.GeoDataFrame objects or None for empty FeatureCollection.
+            Supports only FeatureCollection responses parsing.
+        Yields:
+            tuple[int, list | dict | gpd.GeoDataFrame | None]: index of request in list and its result
+        """
+
+        async def indexed_request(index: int, request: Awaitable) -> tuple[int, list | dict | gpd.GeoDataFrame | None]:
+            return index, await self._extract_request(request, as_gdfs)
 
-        super().__init__(urban_api_json_handler, max_async_extractions)
+        tasks = [asyncio.create_task(indexed_request(i, request)) for i, request in enumerate(requests)]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            for task in tasks:
+                task.cancel()
 
     async def extract_several_requests(self, requests: list[Awaitable], as_gdfs: bool = False) -> list[list | dict]:
         """
@@ -36,28 +115,16 @@ class UrbanApiClient(ApiClient):
         Args:
             requests (list[Awaitable]): list of async request functions to be executed
             as_gdfs (bool): If True, returns gpd.GeoDataFrame objects, otherwise returns raw results.
-            Supports only FeatureCollection responses parsing.
+            Supports only FeatureCollection responses parsing. Empty FeatureCollections are skipped.
         Returns:
-            list[list | dict]: list of results from executed requests
+            list[list | dict]: list of results from executed requests in requests order
         """
 
-        if len(requests) > self.max_async_extractions:
-            results = []
-            for i in range(0, len(requests), self.max_async_extractions):
-                batch_requests = requests[i : i + self.max_async_extractions]
-                results += await asyncio.gather(*batch_requests)
-        else:
-            results = await asyncio.gather(*requests)
+        results = [None] * len(requests)
+        async for index, result in self.iter_several_requests(requests, as_gdfs):
+            results[index] = result
         if as_gdfs:
-            try:
-                results = [gpd.GeoDataFrame.from_features(result, crs=4326) for result in results if result["features"]]
-            except Exception as e:
-                raise http_exception(
-                    500,
-                    "Error during converting results to GeoDataFrame",
-                    _input={"requests": "async requests"},
-                    _detail={"error": repr(e)},
-                ) from e
+            return [result for result in results if result is not None]
         return results
 
     async def get_project_info_by_project_id(
@@ -92,34 +159,117 @@ class UrbanApiClient(ApiClient):
             gpd.GeoDataFrame: GeoDataFrame with territory geometry
         """
 
-        url = f"/api/v1/projects/{project_id}/territory"
-        response = await self.api_handler.get(
-            extra_url=url,
-            headers={"Authorization": f"Bearer {token}"} if token else None,
-        )
+        async def fetch_territory() -> gpd.GeoDataFrame:
+            url = f"/api/v1/projects/{project_id}/territory"
+            response = await self.api_handler.get(
+                extra_url=url,
+                headers={"Authorization": f"Bearer {token}"} if token else None,
+            )
+            return gpd.GeoDataFrame(geometry=[shape(response["geometry"])], crs=4326)
+
+        return await self._cached("territory", ("project", project_id), token, fetch_territory)
 
-        result = gpd.GeoDataFrame(geometry=[shape(response["geometry"])], crs=4326)
+    @staticmethod
+    def _get_features_type_ids(gdf: gpd.GeoDataFrame) -> pd.Series:
+        """
+        Function extracts physical object type IDs for each feature of urban api physical objects response.
+        Supports both features with single physical object properties and features with "physical_objects" list.
+        Args:
+            gdf (gpd.GeoDataFrame): GeoDataFrame parsed from urban api physical objects response.
+        Returns:
+            pd.Series: Series with set of physical object type IDs for each feature.
+        """
+
+        def extract_type_ids(row: pd.Series) -> set[int]:
+            objects = row.get("physical_objects")
+            if not isinstance(objects, list):
+                objects = [row]
+            return {
+                obj["physical_object_type"]["physical_object_type_id"]
+                for obj in objects
+                if isinstance(obj.get("physical_object_type"), dict)
+            }
+
+        return gdf.apply(extract_type_ids, axis=1)
+
+    async def _get_physical_objects_bulk(
+        self,
+        url: str,
+        object_groups: dict[str, list[int]],
+        token: str | None = None,
+    ) -> dict[str, gpd.GeoDataFrame | None] | None:
+        """
+        Function extracts physical objects of all requested types with one request and splits them by groups locally.
+        Args:
+            url (str): URL endpoint to fetch physical objects.
+            object_groups (dict[str, list[int]]): Groups of physical object type IDs to split result by.
+            token (str, optional): Token to authenticate with urban api. Defaults to None.
+        Returns:
+            dict[str, gpd.GeoDataFrame | None] | None: GeoDataFrame with physical objects for each group
+            or None if upstream can not filter objects by several types.
+        """
+
+        endpoint = re.sub(r"/\d+", "/{id}", url)
+        if not self.multi_type_param or not self._multi_type_support.get(endpoint, True):
+            return None
+        object_ids = sorted({object_id for object_ids in object_groups.values() for object_id in object_ids})
+        try:
+            response = await self.api_handler.get(
+                extra_url=url,
+                params={self.multi_type_param: ",".join(map(str, object_ids))},
+                headers={"Authorization": f"Bearer {token}"} if token else None,
+            )
+        except HTTPException as e:
+            if e.status_code not in (400, 422):
+                raise
+            logger.warning(f"Urban api can not filter {endpoint} by several types, falling back to separate requests")
+            self._multi_type_support[endpoint] = False
+            return None
+        if not response["features"]:
+            return {group: None for group in object_groups}
+        gdf = await asyncio.to_thread(self._features_to_gdf, response)
+        type_ids = self._get_features_type_ids(gdf)
+        if type_ids.map(len).eq(0).any():
+            logger.warning(f"Urban api response for {endpoint} has no physical object types, falling back")
+            self._multi_type_support[endpoint] = False
+            return None
+        requested_ids = set(object_ids)
+        if not type_ids.map(requested_ids.intersection).astype(bool).all():
+            logger.warning(f"Urban api ignores several types filter for {endpoint}, next requests will be separate")
+            self._multi_type_support[endpoint] = False
+        result = {}
+        for group, group_ids in object_groups.items():
+            ids = set(group_ids)
+            group_gdf = gdf[type_ids.map(ids.intersection).astype(bool)].copy()
+            result[group] = group_gdf if not group_gdf.empty else None
         return result
 
     async def get_physical_objects(
         self,
         url: str,
-        object_ids: list[int],
+        object_groups: dict[str, list[int]],
         token: str | None = None,
-    ) -> gpd.GeoDataFrame | pd.DataFrame:
+    ) -> dict[str, gpd.GeoDataFrame | pd.DataFrame | None]:
         """
         Function asynchronously extracts physical objects from urban api.
+        All types are requested at once if upstream supports filtering by several types,
+        otherwise one request per physical object type is sent.
         Args:
             url (str): URL endpoint to fetch physical objects.
-            object_ids (list[int]): List of physical object type IDs to filter by.
+            object_groups (dict[str, list[int]]): Groups of physical object type IDs to filter by, e.g. water and roads.
             token (str, optional): Token to authenticate with urban api. Defaults to None.
         Returns:
-            gpd.GeoDataFrame | pd.DataFrame: GeoDataFrame with physical objects or DataFrame if no geometry is present.
+            dict[str, gpd.GeoDataFrame | pd.DataFrame | None]: GeoDataFrame with physical objects for each group
+            or None if no objects of group types found.
         Raises:
             500: Internal Server Error if there is an issue with the request or response parsing
             Any HTTP from urban api will be raised as http_exception
         """
 
+        result = await self._get_physical_objects_bulk(url, object_groups, token)
+        if result is not None:
+            return result
+        object_ids = sorted({object_id for object_ids in object_groups.values() for object_id in object_ids})
         requests = [
             self.api_handler.get(
                 extra_url=url,
@@ -130,50 +280,63 @@ class UrbanApiClient(ApiClient):
             )
             for object_id in object_ids
         ]
-        results = await self.extract_several_requests(requests, as_gdfs=True)
-        if results:
-            return pd.concat(results)
-        else:
-            return None
+        results_by_type = {}
+        async for index, gdf in self.iter_several_requests(requests, as_gdfs=True):
+            if gdf is not None:
+                results_by_type[object_ids[index]] = gdf
+        result = {}
+        for group, group_ids in object_groups.items():
+            group_results = [results_by_type[object_id] for object_id in group_ids if object_id in results_by_type]
+            result[group] = pd.concat(group_results) if group_results else None
+        return result
 
     async def get_physical_objects_for_context(
         self,
         scenario_id: int,
-        object_ids: list[int],
+        object_groups: dict[str, list[int]],
         token: str | None = None,
-    ) -> gpd.GeoDataFrame | pd.DataFrame | None:
+    ) -> dict[str, gpd.GeoDataFrame | pd.DataFrame | None]:
         """
         Function to get physical objects for a project
         Args:
             scenario_id (int): id of project
-            object_ids (list[int]): list of object ids
+            object_groups (dict[str, list[int]]): groups of object type ids
             token (str, optional): token to authenticate with urban api. Defaults to None.
         Returns:
-            gpd.GeoDataFrame | None: gdf with physical objects with listed objects ids or none if noe objects found
+            dict[str, gpd.GeoDataFrame | None]: gdf with physical objects for each group or none if no objects found
         """
 
-        return await self.get_physical_objects(
-            f"/api/v1/scenarios/{scenario_id}/context/geometries_with_all_objects", object_ids, token
+        url = f"/api/v1/scenarios/{scenario_id}/context/geometries_with_all_objects"
+        return await self._cached(
+            "physical_objects",
+            ("scenario", scenario_id, "context", tuple((k, tuple(v)) for k, v in object_groups.items())),
+            token,
+            lambda: self.get_physical_objects(url, object_groups, token),
         )
 
     async def get_physical_objects_for_scenario(
         self,
         scenario_id: int,
-        object_ids: list[int],
+        object_groups: dict[str, list[int]],
         token: str | None = None,
-    ) -> gpd.GeoDataFrame | pd.DataFrame | None:
+    ) -> dict[str, gpd.GeoDataFrame | pd.DataFrame | None]:
         """
         Function to get physical objects for a scenario
         Args:s
             scenario_id (int): id of scenario
-            object_ids (list[int]): list of object ids
+            object_groups (dict[str, list[int]]): groups of object type ids
             token (str, optional): token to authenticate with urban api. Defaults to None.
         Returns:
-            gpd.GeoDataFrame | None: gdf with physical objects with listed objects ids or none if noe objects found
+            dict[str, gpd.GeoDataFrame | None]: gdf with physical objects for each group or none if no objects found
         """
 
         url = f"/api/v1/scenarios/{scenario_id}/physical_objects_with_geometry"
-        return await self.get_physical_objects(url, object_ids, token)
+        return await self._cached(
+            "physical_objects",
+            ("scenario", scenario_id, "scenario", tuple((k, tuple(v)) for k, v in object_groups.items())),
+            token,
+            lambda: self.get_physical_objects(url, object_groups, token),
+        )
 
     async def get_functional_zones(self, token: str | None, scenario_id: int, **kwargs) -> gpd.GeoDataFrame:
         """
@@ -192,17 +355,22 @@ class UrbanApiClient(ApiClient):
             Any HTTP from urban api will be raised as http_exception.
         """
 
-        response = await self.api_handler.get(
-            f"/api/v1/scenarios/{scenario_id}/functional_zones",
-            headers={"Authorization": f"Bearer {token}"} if token else None,
-            params=kwargs,
+        async def fetch_functional_zones() -> gpd.GeoDataFrame:
+            response = await self.api_handler.get(
+                f"/api/v1/scenarios/{scenario_id}/functional_zones",
+                headers={"Authorization": f"Bearer {token}"} if token else None,
+                params=kwargs,
+            )
+            try:
+                return gpd.GeoDataFrame.from_features(response, crs=4326)
+            except Exception as e:
+                raise http_exception(
+                    500,
+                    "Error during parsing functional zones to GeoDataFrame",
+                    _input={"response": response, "crs": 4326},
+                    _detail={"error": repr(e)},
+                ) from e
+
+        return await self._cached(
+            "functional_zones", ("scenario", scenario_id, tuple(sorted(kwargs.items()))), token, fetch_functional_zones
         )
-        try:
-            return gpd.GeoDataFrame.from_features(response, crs=4326)
-        except Exception as e:
-            raise http_exception(
-                500,
-                "Error during parsing functional zones to GeoDataFrame",
-                _input={"response": response, "crs": 4326},
-                _detail={"error": repr(e)},
-            ) from e
@@ -0,0 +1,186 @@
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Awaitable, TypeVar
+
+from loguru import logger
+
+from app.common.exceptions.http_exception import http_exception
+
+T = TypeVar("T")
+
+_reject_when_saturated: ContextVar[bool] = ContextVar("reject_when_saturated", default=True)
+
+
+async def without_rejection(awaitable: Awaitable[T]) -> T:
+    """
+    Function awaits awaitable, so its admissions wait for free capacity without queue limits instead of rejection.
+    Used for background jobs, which are bounded by job manager queue.
+    Args:
+        awaitable (Awaitable[T]): Awaitable to run.
+    Returns:
+        T: Awaitable result.
+    """
+
+    token = _reject_when_saturated.set(False)
+    try:
+        return await awaitable
+    finally:
+        _reject_when_saturated.reset(token)
+
+
+class AdmissionController:
+    """
+    Controller limiting total cost of simultaneous generations with bounded FIFO wait queue.
+    Requests are rejected with 429 if queue is full and with 503 if they waited in queue for too long,
+    both with Retry-After header estimated from average generation duration.
+    Attributes:
+        capacity (int): Maximum total cost of simultaneous generations.
+        max_queue_size (int): Maximum number of generations waiting for capacity.
+        queue_timeout (float): Seconds to wait for capacity before rejection.
+        cost_area_km2 (float): Territory area in km2 adding one cost unit. 0 disables area weighting.
+        cost_zones (int): Number of zones adding one cost unit. 0 disables zones weighting.
+        default_retry_after (float): Seconds to suggest retrying after until generations durations are known.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        max_queue_size: int,
+        queue_timeout: float,
+        cost_area_km2: float = 0,
+        cost_zones: int = 0,
+        default_retry_after: float = 30.0,
+    ):
+        """
+        Function initializes AdmissionController.
+        Args:
+            capacity (int): Maximum total cost of simultaneous generations.
+            max_queue_size (int): Maximum number of generations waiting for capacity.
+            queue_timeout (float): Seconds to wait for capacity before rejection.
+            cost_area_km2 (float): Territory area in km2 adding one cost unit. Defaults to 0, disabling area weighting.
+            cost_zones (int): Number of zones adding one cost unit. Defaults to 0, disabling zones weighting.
+            default_retry_after (float): Seconds to suggest retrying after until generations durations are known.
+            Defaults to 30.
+        """
+
+        self.capacity = capacity
+        self.max_queue_size = max_queue_size
+        self.queue_timeout = queue_timeout
+        self.cost_area_km2 = cost_area_km2
+        self.cost_zones = cost_zones
+        self.default_retry_after = default_retry_after
+        self.in_use = 0
+        self._waiters: deque[tuple[int, asyncio.Future]] = deque()
+        self._average_duration: float | None = None
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for _, future in self._waiters if not future.done())
+
+    def estimate_cost(self, area_km2: float = 0, zones_count: int = 0) -> int:
+        """
+        Function estimates generation cost in capacity units.
+        Args:
+            area_km2 (float): Territory area in km2. Defaults to 0.
+            zones_count (int): Number of fixed and existing zones. Defaults to 0.
+        Returns:
+            int: Generation cost from 1 to capacity.
+        """
+
+        cost = 1
+        if self.cost_area_km2 > 0:
+            cost += int(area_km2 / self.cost_area_km2)
+        if self.cost_zones > 0:
+            cost += zones_count // self.cost_zones
+        return min(cost, self.capacity)
+
+    def get_retry_after(self) -> int:
+        """
+        Function estimates seconds till capacity is available for new generation.
+        Returns:
+            int: Seconds to retry after.
+        """
+
+        duration = self._average_duration or self.default_retry_after
+        return max(1, math.ceil(duration * (self.queued + 1) / self.capacity))
+
+    def _reject(self, status_code: int, msg: str, cost: int) -> None:
+
+        retry_after = self.get_retry_after()
+        logger.warning(f"{msg}, generation with cost {cost} is rejected, retry after {retry_after}s")
+        raise http_exception(
+            status_code,
+            msg,
+            _input={"cost": cost},
+            _detail={"in_use": self.in_use, "capacity": self.capacity, "queued": self.queued},
+            headers={"Retry-After": str(retry_after)},
+        )
+
+    def _wake_waiters(self) -> None:
+
+        while self._waiters:
+            cost, future = self._waiters[0]
+            if future.done():
+                self._waiters.popleft()
+                continue
+            if self.in_use + cost > self.capacity:
+                return
+            self._waiters.popleft()
+            self.in_use += cost
+            future.set_result(None)
+
+    def _release(self, cost: int) -> None:
+
+        self.in_use -= cost
+        self._wake_waiters()
+
+    async def _acquire(self, cost: int) -> None:
+
+        if not self._waiters and self.in_use + cost <= self.capacity:
+            self.in_use += cost
+            return
+        reject = _reject_when_saturated.get()
+        if reject and self.queued >= self.max_queue_size:
+            self._reject(429, "Generation queue is full", cost)
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((cost, future))
+        try:
+            async with asyncio.timeout(self.queue_timeout if reject else None):
+                await future
+        except (TimeoutError, asyncio.CancelledError) as e:
+            future.cancel()
+            if future.done() and not future.cancelled():
+                self._release(cost)
+            else:
+                self._wake_waiters()
+            if isinstance(e, TimeoutError):
+                self._reject(503, "Generation capacity is exhausted", cost)
+            raise
+
+    @asynccontextmanager
+    async def admit(self, cost: int = 1) -> AsyncIterator[None]:
+        """
+        Function waits for free capacity and holds it while generation runs.
+        Only durations of successfully finished generations are used for Retry-After estimation.
+        Args:
+            cost (int): Generation cost in capacity units. Defaults to 1.
+        Raises:
+            429, if wait queue is full.
+            503, if capacity was not available during queue timeout.
+        """
+
+        cost = max(1, min(cost, self.capacity))
+        await self._acquire(cost)
+        started_at = time.perf_counter()
+        try:
+            yield
+            duration = time.perf_counter() - started_at
+            self._average_duration = (
+                duration if self._average_duration is None else 0.8 * self._average_duration + 0.2 * duration
+            )
+        finally:
+            self._release(cost)
@@ -0,0 +1,94 @@
+"""Request deadline propagation to upstream requests is defined here."""
+
+import time
+from contextvars import ContextVar, Token
+
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.common.exceptions.http_exception import http_exception
+
+DEADLINE_HEADER = "X-Request-Timeout"
+
+_deadline: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+
+def set_deadline(timeout: float | None) -> Token:
+    """
+    Function sets deadline for upstream requests in current context.
+    Args:
+        timeout (float | None): Seconds from now till deadline. If None, deadline is removed.
+    Returns:
+        Token: Token to reset deadline with.
+    """
+
+    return _deadline.set(time.monotonic() + timeout if timeout is not None else None)
+
+
+def reset_deadline(token: Token) -> None:
+    """
+    Function restores deadline which was set before set_deadline call.
+    Args:
+        token (Token): Token returned by set_deadline.
+    """
+
+    _deadline.reset(token)
+
+
+def get_remaining_time() -> float | None:
+    """
+    Function returns time left till deadline in current context.
+    Returns:
+        float | None: Seconds till deadline, negative if deadline is exceeded, None if deadline is not set.
+    """
+
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+class DeadlineMiddleware(BaseHTTPMiddleware):  # pylint: disable=too-few-public-methods
+    """Set deadline for upstream requests made while handling request.
+    Deadline is taken from X-Request-Timeout header in seconds, limited by app.state.request_deadline.
+    Attributes:
+           app (FastAPI): The FastAPI application instance.
+    """
+
+    def __init__(self, app: FastAPI):
+        """
+        Deadline middleware init function.
+        Args:
+            app (FastAPI): The FastAPI application instance.
+        """
+
+        super().__init__(app)
+
+    async def dispatch(self, request: Request, call_next):
+        """
+        Dispatch function setting request deadline
+        Args:
+            request (Request): The incoming request object.
+            call_next: function to extract.
+        """
+
+        timeout = getattr(request.app.state, "request_deadline", None)
+        header_value = request.headers.get(DEADLINE_HEADER)
+        if header_value is not None:
+            try:
+                requested_timeout = float(header_value)
+            except ValueError:
+                requested_timeout = 0
+            if requested_timeout <= 0:
+                raise http_exception(
+                    400,
+                    f"{DEADLINE_HEADER} header should be a positive number of seconds",
+                    _input={DEADLINE_HEADER: header_value},
+                    _detail=None,
+                )
+            timeout = min(timeout, requested_timeout) if timeout else requested_timeout
+        token = set_deadline(timeout or None)
+        try:
+            return await call_next(request)
+        finally:
+            reset_deadline(token)
@@ -1,27 +1,136 @@
+import asyncio
+import math
+import random
+import re
+import time
+from collections import deque
+from typing import Hashable
+
 import aiohttp
+import numpy as np
+from fastapi import HTTPException
 from loguru import logger
 
+from app.common.auth.bearer import get_token_scope
 from app.common.exceptions.http_exception import http_exception
+from app.common.metrics.metrics import UPSTREAM_REQUEST_DURATION
+from app.common.tracing.tracer import TRACEPARENT_HEADER, trace_span
+
+from .deadline import get_remaining_time
+
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
 
 
 class AsyncJsonApiHandler:
     """
-    Class for handling async requests to apies
+    Class for handling async requests to apies.
+    Keeps one pooled aiohttp session per handler, so connections to the upstream are reused between requests.
+    Number of simultaneous requests to the upstream is limited per handler, so the limit is shared by all callers.
+    Identical GET requests in flight are coalesced: concurrent callers with the same url, params and authorization scope
+    share one upstream request and receive the same result object, which must not be mutated. Caller joins request in
+    flight only if its deadline is not earlier than caller's one, request is cancelled when all its callers leave.
+    GET requests are bounded by the deadline of current context, hedged with a duplicate request when they are slower
+    than usual for the endpoint, and retried with jittered exponential backoff on connection errors and 429/502/503/504.
     """
 
     def __init__(
         self,
         base_url: str,
+        max_concurrent_requests: int = 40,
+        connection_limit: int = 100,
+        connection_limit_per_host: int = 30,
+        keepalive_timeout: float = 30.0,
+        dns_cache_ttl: int = 300,
+        connect_timeout: float = 10.0,
+        read_timeout: float = 300.0,
+        max_retries: int = 2,
+        retry_backoff: float = 0.2,
+        retry_backoff_max: float = 5.0,
+        hedge_percentile: float = 95.0,
+        hedge_min_samples: int = 20,
+        latency_window: int = 200,
     ) -> None:
         """
         Initialisation function
         Args:
             base_url (str): Base api url
+            max_concurrent_requests (int): Maximum number of simultaneous requests to upstream. Defaults to 40.
+            connection_limit (int): Total number of simultaneous connections in pool. Defaults to 100.
+            connection_limit_per_host (int): Number of simultaneous connections to one host. Defaults to 30.
+            keepalive_timeout (float): Seconds to keep idle connection alive. Defaults to 30.
+            dns_cache_ttl (int): Seconds to cache resolved DNS records. Defaults to 300.
+            connect_timeout (float): Seconds to wait for connection from pool and upstream. Defaults to 10.
+            read_timeout (float): Seconds to wait for upstream response data. Defaults to 300.
+            max_retries (int): Number of GET request retries on transient errors. Defaults to 2.
+            retry_backoff (float): Base of exponential backoff between retries in seconds. Defaults to 0.2.
+            retry_backoff_max (float): Maximum backoff between retries in seconds. Defaults to 5.
+            hedge_percentile (float): Percentile of endpoint latency to send hedged request after. 0 disables hedging.
+            Defaults to 95.
+            hedge_min_samples (int): Number of endpoint latency samples required to start hedging. Defaults to 20.
+            latency_window (int): Number of last endpoint latency samples to keep. Defaults to 200.
         Returns:
             None
         """
 
         self.base_url = base_url
+        self.max_concurrent_requests = max_concurrent_requests
+        self._requests_semaphore = asyncio.Semaphore(max_concurrent_requests)
+        self.connection_limit = connection_limit
+        self.connection_limit_per_host = connection_limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.timeout = aiohttp.ClientTimeout(connect=connect_timeout, sock_read=read_timeout)
+        self._session: aiohttp.ClientSession | None = None
+        self._in_flight: dict[tuple[Hashable, ...], tuple[asyncio.Task, float]] = {}
+        self._waiters: dict[asyncio.Task, int] = {}
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.retry_backoff_max = retry_backoff_max
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.latency_window = latency_window
+        self._latencies: dict[str, deque[float]] = {}
+
+    async def start(self) -> None:
+        """
+        Function opens pooled client session if it is not opened yet
+        Returns:
+            None
+        """
+
+        if self._session and not self._session.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.connection_limit,
+            limit_per_host=self.connection_limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.dns_cache_ttl,
+        )
+        self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        logger.info(f"Opened connection pool for {self.base_url}")
+
+    async def close(self) -> None:
+        """
+        Function closes pooled client session with all kept alive connections
+        Returns:
+            None
+        """
+
+        if self._session and not self._session.closed:
+            await self._session.close()
+            logger.info(f"Closed connection pool for {self.base_url}")
+        self._session = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Function returns pooled client session, opening it on first use
+        Returns:
+            aiohttp.ClientSession: pooled client session
+        """
+
+        if not self._session or self._session.closed:
+            await self.start()
+        return self._session
 
     @staticmethod
     async def _return_result_or_raise_error(
@@ -46,6 +155,130 @@ class AsyncJsonApiHandler:
             _detail=additional_info,
         )
 
+    @staticmethod
+    def _form_request_key(endpoint_url: str, params: dict | None, headers: dict | None) -> tuple[Hashable, ...]:
+        """
+        Function forms key of GET request for coalescing, authorization header is kept only as token scope.
+        Args:
+            endpoint_url (str): Full endpoint url.
+            params (dict | None): Query parameters.
+            headers (dict | None): Headers for query.
+        Returns:
+            tuple[Hashable, ...]: Request key.
+        """
+
+        headers = dict(headers or {})
+        authorization = headers.pop("Authorization", None)
+        return (
+            endpoint_url,
+            tuple(sorted((str(key), str(value)) for key, value in (params or {}).items())),
+            get_token_scope(authorization),
+            tuple(sorted(headers.items())),
+        )
+
+    async def _request(self, endpoint: str, endpoint_url: str, params: dict | None, headers: dict | None) -> dict:
+
+        session = await self._get_session()
+        remaining = get_remaining_time()
+        timeout = (
+            aiohttp.ClientTimeout(total=remaining, connect=self.timeout.connect, sock_read=self.timeout.sock_read)
+            if remaining is not None
+            else None
+        )
+        async with self._requests_semaphore:
+            with trace_span(f"GET {endpoint}", "client", **{"http.url": endpoint_url, "http.params": params}) as span:
+                if span is not None:
+                    headers = {**(headers or {}), TRACEPARENT_HEADER: span.traceparent}
+                started_at = time.perf_counter()
+                status = "error"
+                try:
+                    async with session.get(
+                        url=endpoint_url, params=params, headers=headers, timeout=timeout
+                    ) as response:
+                        status = str(response.status)
+                        try:
+                            result = await self._return_result_or_raise_error(
+                                response=response,
+                                endpoint_url=endpoint_url,
+                                params=params,
+                            )
+                        finally:
+                            if span is not None:
+                                span.set_attributes(**{"http.response_bytes": response.content.total_bytes})
+                except asyncio.CancelledError:
+                    status = "cancelled"
+                    raise
+                finally:
+                    duration = time.perf_counter() - started_at
+                    UPSTREAM_REQUEST_DURATION.labels(self.base_url, endpoint, status).observe(duration)
+                    if span is not None:
+                        span.set_attributes(**{"http.status_code": status})
+        latencies = self._latencies.setdefault(endpoint, deque(maxlen=self.latency_window))
+        latencies.append(duration)
+        return result
+
+    def get_hedge_delay(self, endpoint: str) -> float | None:
+        """
+        Function returns delay to send hedged request after for endpoint.
+        Args:
+            endpoint (str): Endpoint url with ids replaced by {id}.
+        Returns:
+            float | None: Endpoint latency percentile in seconds or None if hedging is disabled or samples are few.
+        """
+
+        latencies = self._latencies.get(endpoint)
+        if not self.hedge_percentile or not latencies or len(latencies) < self.hedge_min_samples:
+            return None
+        return float(np.percentile(latencies, self.hedge_percentile))
+
+    async def _hedged_request(
+        self, endpoint: str, endpoint_url: str, params: dict | None, headers: dict | None
+    ) -> dict:
+
+        hedge_delay = self.get_hedge_delay(endpoint)
+        if hedge_delay is None:
+            return await self._request(endpoint, endpoint_url, params, headers)
+        tasks = [asyncio.create_task(self._request(endpoint, endpoint_url, params, headers))]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+            if not done:
+                logger.debug(f"Hedging request {endpoint_url} with params {params} after {hedge_delay:.3f}s")
+                tasks.append(asyncio.create_task(self._request(endpoint, endpoint_url, params, headers)))
+            pending, error = set(tasks), None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _get(self, endpoint_url: str, params: dict | None, headers: dict | None) -> dict:
+
+        endpoint = re.sub(r"/\d+", "/{id}", endpoint_url.removeprefix(self.base_url))
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await self._hedged_request(endpoint, endpoint_url, params, headers)
+            except (aiohttp.ClientError, TimeoutError, HTTPException) as e:
+                if isinstance(e, HTTPException) and e.status_code not in RETRY_STATUSES:
+                    raise
+                backoff = random.uniform(0, min(self.retry_backoff_max, self.retry_backoff * 2**attempt))
+                remaining = get_remaining_time()
+                if attempt == self.max_retries or (remaining is not None and backoff >= remaining):
+                    raise
+                logger.warning(f"Retrying request {endpoint_url} in {backoff:.3f}s after error {repr(e)}")
+                await asyncio.sleep(backoff)
+
+    def _forget_request(self, key: tuple[Hashable, ...], task: asyncio.Task) -> None:
+
+        if key in self._in_flight and self._in_flight[key][0] is task:
+            del self._in_flight[key]
+        if task.done() and not task.cancelled():
+            task.exception()
+
     async def get(
         self,
         extra_url: str,
@@ -53,7 +286,9 @@ class AsyncJsonApiHandler:
         headers: dict = None,
     ) -> dict:
         """
-        Function extracts get query within extra url
+        Function extracts get query within extra url.
+        If identical query is already in flight, waits for its result instead of sending a new one.
+        Waits not longer than the deadline of current context, upstream query is cancelled when all its callers leave.
 
         Args:
             extra_url (str): Endpoint url
@@ -61,15 +296,48 @@ class AsyncJsonApiHandler:
             headers (dict): Headers for queries
 
         Returns:
-            dict: Query result in dict format
+            dict: Query result in dict format, shared between coalesced callers
         """
 
         endpoint_url = self.base_url + extra_url
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url=endpoint_url, params=params, headers=headers) as response:
-                result = await self._return_result_or_raise_error(
-                    response=response,
-                    endpoint_url=endpoint_url,
-                    params=params,
-                )
-                return result
+        remaining = get_remaining_time()
+        if remaining is not None and remaining <= 0:
+            raise http_exception(
+                504,
+                "Request deadline exceeded before upstream request",
+                _input={"url": endpoint_url, "params": params},
+                _detail={"remaining_time": remaining},
+            )
+        key = self._form_request_key(endpoint_url, params, headers)
+        deadline_at = time.monotonic() + remaining if remaining is not None else math.inf
+        in_flight = self._in_flight.get(key)
+        if in_flight is None or in_flight[1] < deadline_at:
+            task = asyncio.create_task(self._get(endpoint_url, params, headers))
+            self._in_flight[key] = (task, deadline_at)
+            task.add_done_callback(lambda finished: self._forget_request(key, finished))
+        else:
+            task = in_flight[0]
+            logger.debug(f"Coalesced request {endpoint_url} with params {params} with request in flight")
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        deadline = asyncio.timeout(remaining)
+        try:
+            async with deadline:
+                return await asyncio.shield(task)
+        except TimeoutError as e:
+            raise http_exception(
+                504,
+                (
+                    "Request deadline exceeded while waiting for upstream"
+                    if deadline.expired()
+                    else "Upstream request timed out"
+                ),
+                _input={"url": endpoint_url, "params": params},
+                _detail={"timeout": remaining},
+            ) from e
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                if not task.done():
+                    task.cancel()
+                    self._forget_request(key, task)
@@ -0,0 +1,27 @@
+import secrets
+
+from fastapi import Request
+
+from app.common.exceptions.http_exception import http_exception
+
+ADMIN_KEY_HEADER = "X-Admin-Key"
+
+
+def verify_admin_key(request: Request) -> None:
+    """
+    Function checks X-Admin-Key header against ADMIN_KEY config value for operator endpoints.
+    Args:
+        request (Request): Incoming request.
+    Raises:
+        403, if operator endpoints are disabled or key does not match.
+    """
+
+    admin_key = request.app.state.admin_key
+    key = request.headers.get(ADMIN_KEY_HEADER)
+    if not admin_key or not key or not secrets.compare_digest(key.encode(), admin_key.encode()):
+        raise http_exception(
+            403,
+            "Operator endpoints are disabled or admin key is invalid",
+            _input={"header": ADMIN_KEY_HEADER},
+            _detail=None,
+        )
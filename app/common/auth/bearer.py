@@ -1,7 +1,10 @@
+import hashlib
+
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 http_bearer = HTTPBearer()
+optional_http_bearer = HTTPBearer(auto_error=False)
 
 
 async def verify_bearer_token(credentials: HTTPAuthorizationCredentials = Depends(http_bearer)) -> str:
@@ -17,3 +20,26 @@ async def verify_bearer_token(credentials: HTTPAuthorizationCredentials = Depend
         raise HTTPException(status_code=400, detail="Token is missing in the authorization header")
 
     return token
+
+
+async def optional_bearer_token(
+    credentials: HTTPAuthorizationCredentials | None = Depends(optional_http_bearer),
+) -> str | None:
+
+    if not credentials or not credentials.credentials:
+        return None
+    return credentials.credentials
+
+
+def get_token_scope(token: str | None) -> str:
+    """
+    Function forms authorization scope from token without keeping token itself.
+    Args:
+        token (str | None): User bearer access token.
+    Returns:
+        str: sha256 hash of token or "anonymous" if token is not provided.
+    """
+
+    if not token:
+        return "anonymous"
+    return hashlib.sha256(token.encode()).hexdigest()
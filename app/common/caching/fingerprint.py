@@ -0,0 +1,63 @@
+import hashlib
+import json
+from typing import Any
+
+import geopandas as gpd
+import pandas as pd
+import shapely
+
+
+def fingerprint_params(params: Any) -> str:
+    """
+    Function forms canonical hash of JSON-serializable request params.
+    Args:
+        params (Any): JSON-serializable params, e.g. pydantic model dump in json mode.
+    Returns:
+        str: sha256 hex digest of params dumped with sorted keys.
+    """
+
+    dumped = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(dumped.encode()).hexdigest()
+
+
+def fingerprint_gdf(gdf: gpd.GeoDataFrame | pd.DataFrame | None) -> str:
+    """
+    Function forms hash of GeoDataFrame content including crs, geometries and attributes.
+    Args:
+        gdf (gpd.GeoDataFrame | pd.DataFrame | None): Frame to hash.
+    Returns:
+        str: sha256 hex digest of frame content or "none" for None.
+    """
+
+    if gdf is None:
+        return "none"
+    digest = hashlib.sha256()
+    digest.update(repr(sorted(map(str, gdf.columns))).encode())
+    geometry_name = None
+    if isinstance(gdf, gpd.GeoDataFrame) and gdf.geometry.name in gdf.columns:
+        geometry_name = gdf.geometry.name
+        digest.update(str(gdf.crs).encode())
+        for wkb in shapely.to_wkb(gdf.geometry.values):
+            digest.update(wkb if wkb is not None else b"\x00")
+    for column in sorted(gdf.columns, key=str):
+        if column == geometry_name:
+            continue
+        series = gdf[column]
+        try:
+            hashed = pd.util.hash_pandas_object(series, index=False)
+        except TypeError:
+            hashed = pd.util.hash_pandas_object(series.map(repr), index=False)
+        digest.update(hashed.values.tobytes())
+    return digest.hexdigest()
+
+
+def fingerprint_inputs(*parts: str) -> str:
+    """
+    Function combines several fingerprints to one.
+    Args:
+        *parts (str): Fingerprints to combine.
+    Returns:
+        str: sha256 hex digest of combined fingerprints.
+    """
+
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
@@ -0,0 +1,217 @@
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+import geopandas as gpd
+import pandas as pd
+import shapely
+from loguru import logger
+
+from app.common.auth.bearer import get_token_scope
+
+T = TypeVar("T")
+
+MISSING = object()
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Function estimates memory size of cached value in bytes.
+    Geometries are estimated by number of coordinates, other columns by pandas deep memory usage.
+    Args:
+        value (Any): Value to estimate, supports bytes, GeoDataFrame, DataFrame, dict, list and tuple of them.
+    Returns:
+        int: Estimated size in bytes.
+    """
+
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, gpd.GeoDataFrame):
+        geometry_size = 0
+        if value.geometry.name in value.columns:
+            geometry_size = int(shapely.get_num_coordinates(value.geometry.values).sum()) * 16 + len(value) * 100
+        attributes = value.drop(columns=value.geometry.name, errors="ignore")
+        return geometry_size + int(attributes.memory_usage(deep=True).sum())
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, dict):
+        return sum(estimate_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(v) for v in value)
+    return 64
+
+
+def copy_value(value: T) -> T:
+    """
+    Function copies cached value, so callers can modify it without corrupting cache.
+    Args:
+        value (T): Cached value.
+    Returns:
+        T: Copy of DataFrames, dicts, lists and tuples of them, other values as is.
+    """
+
+    if isinstance(value, pd.DataFrame):
+        return value.copy()
+    if isinstance(value, dict):
+        return {k: copy_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [copy_value(v) for v in value]
+    if isinstance(value, tuple):
+        return tuple(copy_value(v) for v in value)
+    return value
+
+
+class _CacheEntry:
+
+    __slots__ = ("value", "expires_at", "size")
+
+    def __init__(self, value: Any, expires_at: float, size: int):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+
+
+class GeoDataCache:
+    """
+    In-process cache for upstream geodata with per-source TTL and LRU eviction by estimated memory size.
+    Entries are scoped by token hash, so cached data is served only to requests with the same authorization.
+    Attributes:
+        ttls (dict[str, float]): TTL in seconds for each data source.
+        default_ttl (float): TTL in seconds for sources missing in ttls.
+        max_size_bytes (int): Maximum estimated size of all cached values.
+    """
+
+    def __init__(self, ttls: dict[str, float], max_size_bytes: int, default_ttl: float = 600.0):
+        """
+        Function initializes GeoDataCache.
+        Args:
+            ttls (dict[str, float]): TTL in seconds for each data source.
+            max_size_bytes (int): Maximum estimated size of all cached values.
+            default_ttl (float): TTL in seconds for sources missing in ttls. Defaults to 600.
+        """
+
+        self.ttls = ttls
+        self.default_ttl = default_ttl
+        self.max_size_bytes = max_size_bytes
+        self.size_bytes = 0
+        self._entries: OrderedDict[tuple, _CacheEntry] = OrderedDict()
+        self._hits: dict[str, int] = {}
+        self._misses: dict[str, int] = {}
+
+    def _remove(self, full_key: tuple) -> None:
+
+        entry = self._entries.pop(full_key)
+        self.size_bytes -= entry.size
+
+    def get(self, source: str, key: tuple[Hashable, ...], token: str | None) -> Any:
+        """
+        Function returns copy of cached value or MISSING if value is not cached or expired.
+        Args:
+            source (str): Data source name.
+            key (tuple[Hashable, ...]): Entry key, starting with entity name and id, e.g. ("scenario", 835).
+            token (str | None): User bearer access token.
+        Returns:
+            Any: copy of cached value or MISSING.
+        """
+
+        full_key = (source, get_token_scope(token), key)
+        entry = self._entries.get(full_key)
+        if entry is None or entry.expires_at < time.monotonic():
+            if entry is not None:
+                self._remove(full_key)
+            self._misses[source] = self._misses.get(source, 0) + 1
+            return MISSING
+        self._entries.move_to_end(full_key)
+        self._hits[source] = self._hits.get(source, 0) + 1
+        return copy_value(entry.value)
+
+    def set(self, source: str, key: tuple[Hashable, ...], token: str | None, value: Any) -> None:
+        """
+        Function caches value and evicts least recently used entries if cache size is exceeded.
+        Args:
+            source (str): Data source name.
+            key (tuple[Hashable, ...]): Entry key, starting with entity name and id, e.g. ("scenario", 835).
+            token (str | None): User bearer access token.
+            value (Any): Value to cache.
+        """
+
+        full_key = (source, get_token_scope(token), key)
+        if full_key in self._entries:
+            self._remove(full_key)
+        size = estimate_size(value)
+        if size > self.max_size_bytes:
+            logger.warning(f"Value for {source} {key} exceeds cache size limit and won't be cached")
+            return
+        while self._entries and self.size_bytes + size > self.max_size_bytes:
+            self._remove(next(iter(self._entries)))
+        ttl = self.ttls.get(source, self.default_ttl)
+        self._entries[full_key] = _CacheEntry(copy_value(value), time.monotonic() + ttl, size)
+        self.size_bytes += size
+
+    async def get_or_fetch(
+        self, source: str, key: tuple[Hashable, ...], token: str | None, fetch: Callable[[], Awaitable[T]]
+    ) -> T:
+        """
+        Function returns cached value or fetches and caches it.
+        Args:
+            source (str): Data source name.
+            key (tuple[Hashable, ...]): Entry key, starting with entity name and id, e.g. ("scenario", 835).
+            token (str | None): User bearer access token.
+            fetch (Callable[[], Awaitable[T]]): Async function to fetch value on cache miss.
+        Returns:
+            T: Cached or fetched value.
+        """
+
+        value = self.get(source, key, token)
+        if value is not MISSING:
+            return value
+        value = await fetch()
+        self.set(source, key, token, value)
+        return value
+
+    def invalidate(self, source: str | None = None, entity: str | None = None, entity_id: int | None = None) -> int:
+        """
+        Function removes cached entries matching all provided filters for all tokens.
+        Args:
+            source (str | None): Data source name to invalidate. Defaults to None for all sources.
+            entity (str | None): Entity name to invalidate, e.g. "project" or "scenario". Defaults to None.
+            entity_id (int | None): Entity id to invalidate. Defaults to None.
+        Returns:
+            int: Number of removed entries.
+        """
+
+        to_remove = [
+            full_key
+            for full_key in self._entries
+            if (source is None or full_key[0] == source)
+            and (entity is None or full_key[2][0] == entity)
+            and (entity_id is None or full_key[2][1] == entity_id)
+        ]
+        for full_key in to_remove:
+            self._remove(full_key)
+        logger.info(f"Invalidated {len(to_remove)} geodata cache entries")
+        return len(to_remove)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Function returns cache usage statistics.
+        Returns:
+            dict[str, Any]: Entries number, size and hit/miss counters for each source.
+        """
+
+        sources = sorted(set(self._hits) | set(self._misses) | set(self.ttls))
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self.size_bytes,
+            "max_size_bytes": self.max_size_bytes,
+            "sources": {
+                source: {
+                    "ttl": self.ttls.get(source, self.default_ttl),
+                    "hits": self._hits.get(source, 0),
+                    "misses": self._misses.get(source, 0),
+                }
+                for source in sources
+            },
+        }
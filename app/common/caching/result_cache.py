@@ -0,0 +1,170 @@
+import asyncio
+import os
+import pickle
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from .geodata_cache import MISSING, copy_value, estimate_size
+
+
+class GenerationResultCache:
+    """
+    Two-tier cache for generation results keyed by request and upstream inputs fingerprint.
+    Memory tier keeps the most recently used results within size limit,
+    disk tier keeps pickled results within size limit, evicting least recently accessed files.
+    Attributes:
+        memory_max_bytes (int): Maximum estimated size of results in memory.
+        disk_path (Path | None): Directory for pickled results. If None, disk tier is disabled.
+        disk_max_bytes (int): Maximum size of pickled results on disk.
+        name (str): Cache name for logs.
+    """
+
+    def __init__(
+        self,
+        memory_max_bytes: int,
+        disk_path: Path | None = None,
+        disk_max_bytes: int = 0,
+        name: str = "generation result",
+    ):
+        """
+        Function initializes GenerationResultCache.
+        Args:
+            memory_max_bytes (int): Maximum estimated size of results in memory.
+            disk_path (Path | None): Directory for pickled results. Defaults to None, disabling disk tier.
+            disk_max_bytes (int): Maximum size of pickled results on disk. Defaults to 0.
+            name (str): Cache name for logs. Defaults to "generation result".
+        """
+
+        self.name = name
+        self.memory_max_bytes = memory_max_bytes
+        self.memory_size_bytes = 0
+        self.disk_path = disk_path if disk_path and disk_max_bytes > 0 else None
+        self.disk_max_bytes = disk_max_bytes
+        self._memory: OrderedDict[str, tuple[Any, int]] = OrderedDict()
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        if self.disk_path:
+            self.disk_path.mkdir(parents=True, exist_ok=True)
+
+    def _memory_get(self, key: str) -> Any:
+
+        item = self._memory.get(key)
+        if item is None:
+            return MISSING
+        self._memory.move_to_end(key)
+        return item[0]
+
+    def _memory_set(self, key: str, value: Any) -> None:
+
+        if key in self._memory:
+            self.memory_size_bytes -= self._memory.pop(key)[1]
+        size = estimate_size(value)
+        if size > self.memory_max_bytes:
+            return
+        while self._memory and self.memory_size_bytes + size > self.memory_max_bytes:
+            self.memory_size_bytes -= self._memory.popitem(last=False)[1][1]
+        self._memory[key] = (value, size)
+        self.memory_size_bytes += size
+
+    def _disk_get(self, key: str) -> Any:
+
+        file_path = self.disk_path / f"{key}.pkl"
+        try:
+            with open(file_path, "rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return MISSING
+        except (OSError, pickle.PickleError, EOFError) as e:
+            logger.warning(f"Could not read cached result {file_path}: {repr(e)}")
+            file_path.unlink(missing_ok=True)
+            return MISSING
+        os.utime(file_path)
+        return value
+
+    def _disk_set(self, key: str, value: Any) -> None:
+
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.disk_max_bytes:
+            return
+        files = sorted(self.disk_path.glob("*.pkl"), key=lambda p: p.stat().st_mtime)
+        disk_size = sum(p.stat().st_size for p in files)
+        while files and disk_size + len(data) > self.disk_max_bytes:
+            oldest = files.pop(0)
+            disk_size -= oldest.stat().st_size
+            oldest.unlink(missing_ok=True)
+        tmp_path = self.disk_path / f"{key}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        tmp_path.replace(self.disk_path / f"{key}.pkl")
+
+    async def get(self, key: str) -> Any:
+        """
+        Function returns copy of cached result from memory or disk tier.
+        Args:
+            key (str): Result fingerprint.
+        Returns:
+            Any: copy of cached result or MISSING if result is not cached.
+        """
+
+        value = self._memory_get(key)
+        if value is not MISSING:
+            self._counters["memory_hits"] += 1
+            return copy_value(value)
+        if self.disk_path:
+            value = await asyncio.to_thread(self._disk_get, key)
+            if value is not MISSING:
+                self._counters["disk_hits"] += 1
+                self._memory_set(key, value)
+                return copy_value(value)
+        self._counters["misses"] += 1
+        return MISSING
+
+    async def set(self, key: str, value: Any) -> None:
+        """
+        Function caches result in memory and disk tiers.
+        Args:
+            key (str): Result fingerprint.
+            value (Any): Result to cache, must be picklable.
+        """
+
+        value = copy_value(value)
+        self._memory_set(key, value)
+        if self.disk_path:
+            try:
+                await asyncio.to_thread(self._disk_set, key, value)
+            except (OSError, pickle.PicklingError) as e:
+                logger.warning(f"Could not write result {key} to disk cache: {repr(e)}")
+
+    def clear(self) -> int:
+        """
+        Function removes all cached results from memory and disk tiers.
+        Returns:
+            int: Number of removed results in memory tier.
+        """
+
+        removed = len(self._memory)
+        self._memory.clear()
+        self.memory_size_bytes = 0
+        if self.disk_path:
+            for file_path in self.disk_path.glob("*.pkl"):
+                file_path.unlink(missing_ok=True)
+        logger.info(f"Cleared {self.name} cache")
+        return removed
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Function returns result cache usage statistics.
+        Returns:
+            dict[str, Any]: Size of tiers and hit/miss counters.
+        """
+
+        return {
+            "memory_entries": len(self._memory),
+            "memory_size_bytes": self.memory_size_bytes,
+            "memory_max_bytes": self.memory_max_bytes,
+            "disk_enabled": self.disk_path is not None,
+            "disk_max_bytes": self.disk_max_bytes,
+            **self._counters,
+        }
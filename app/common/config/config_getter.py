@@ -0,0 +1,24 @@
+from typing import Callable, TypeVar
+
+from iduconfig import Config
+
+T = TypeVar("T")
+
+
+def get_config_value(config: Config, key: str, default: T, cast: Callable[[str], T] = str) -> T:
+    """
+    Function retrieves optional value from app config.
+    Args:
+        config (Config): App config instance.
+        key (str): Name of env variable.
+        default (T): Value to return if env variable is not set.
+        cast (Callable[[str], T]): Function to cast env variable value with. Defaults to str.
+    Returns:
+        T: Casted env variable value or default.
+    """
+
+    try:
+        value = config.get(key)
+    except ValueError:
+        return default
+    return cast(value)
@@ -1,10 +1,13 @@
 import json
+from contextvars import ContextVar
 from pathlib import Path
 from typing import Any, Literal, Optional, Self
 
 import geopandas as gpd
+import numpy as np
+import shapely
 from genplanner import FuncZone, TerritoryZone
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic import BaseModel, Field, ModelWrapValidatorHandler, ValidationError, field_validator, model_validator
 from pyproj import CRS
 from shapely.geometry import shape
 from shapely.geometry.base import BaseGeometry
@@ -14,6 +17,7 @@ from app.common.exceptions.http_exception import http_exception
 
 folder_path = Path(__file__).parent.absolute()
 geom_types = ["Point", "MultiPoint", "LineString", "MultiLineString", "Polygon", "MultiPolygon"]
+geom_nesting = {"Point": 1, "MultiPoint": 2, "LineString": 2, "MultiLineString": 3, "Polygon": 3, "MultiPolygon": 4}
 
 
 with open(folder_path / "examples/example_geometry.json", "r") as et:
@@ -26,6 +30,106 @@ with open(folder_path / "examples/linestring_geometry.json", "r") as lg:
     linestring_geom = json.load(lg)
 
 fixed_zones_name = []
+available_fixed_zones_names = list(custom_ter_zones_map_by_name.keys())
+available_fixed_zones_ids = list(scenario_func_zones_map.keys())
+fixed_zones_keys = frozenset(available_fixed_zones_names + available_fixed_zones_ids)
+_bulk_validation: ContextVar[bool] = ContextVar("bulk_geojson_validation", default=False)
+
+
+def get_nesting_depth(coordinates: Any) -> int | None:
+    """
+    Function counts nesting level of the coordinates by their first elements.
+    Args:
+        coordinates (Any): Coordinates of the geometry.
+    Returns:
+        int | None: Nesting level, None if some nested list is empty.
+    """
+
+    counter = 0
+    check = coordinates
+    while isinstance(check, list):
+        if not check:
+            return None
+        check = check[0]
+        counter += 1
+    return counter
+
+
+def is_fixed_zone_key(value: Any) -> bool:
+    """
+    Function checks if the value is an available fixed zone name or id.
+    Args:
+        value (Any): 'fixed_zone' property value.
+    Returns:
+        bool: True if value is available fixed zone key.
+    """
+
+    try:
+        return value in fixed_zones_keys
+    except TypeError:
+        return False
+
+
+def _build_polygon(rings: list) -> shapely.Polygon:
+    holes = [shapely.linearrings(np.asarray(ring, dtype=float)) for ring in rings[1:]]
+    return shapely.polygons(np.asarray(rings[0], dtype=float), holes=holes or None)
+
+
+def build_geometry(geom_type: str, coordinates: list) -> BaseGeometry:
+    """
+    Function builds shapely geometry from GeoJSON coordinates with array constructors.
+    Args:
+        geom_type (str): GeoJSON geometry type.
+        coordinates (list): Coordinates of the geometry.
+    Returns:
+        BaseGeometry: Built geometry.
+    """
+
+    match geom_type:
+        case "Point":
+            return shapely.points(np.asarray(coordinates, dtype=float))
+        case "MultiPoint":
+            return shapely.multipoints(np.asarray(coordinates, dtype=float))
+        case "LineString":
+            return shapely.linestrings(np.asarray(coordinates, dtype=float))
+        case "MultiLineString":
+            return shapely.multilinestrings(
+                [shapely.linestrings(np.asarray(line, dtype=float)) for line in coordinates]
+            )
+        case "Polygon":
+            return _build_polygon(coordinates)
+        case "MultiPolygon":
+            return shapely.multipolygons([_build_polygon(polygon) for polygon in coordinates])
+    raise ValueError(f"Unknown geometry type {geom_type}")
+
+
+def build_geometries(geometries: list["Geometry"]) -> np.ndarray:
+    """
+    Function builds shapely geometries for the list of Geometry models, points are built in one call.
+    Args:
+        geometries (list[Geometry]): Geometry models.
+    Returns:
+        np.ndarray: Array of shapely geometries.
+    """
+
+    result = np.empty(len(geometries), dtype=object)
+    types = np.array([geometry.type for geometry in geometries])
+    points = np.flatnonzero(types == "Point")
+    if len(points):
+        result[points] = shapely.points(np.asarray([geometries[i].coordinates for i in points], dtype=float))
+    for i in np.flatnonzero(types != "Point"):
+        result[i] = build_geometry(geometries[i].type, geometries[i].coordinates)
+    return result
+
+
+def skip_feature_validation() -> bool:
+    """
+    Function checks if per-feature validators should be skipped, because the collection is validated in bulk.
+    Returns:
+        bool: True inside bulk FeatureCollection validation.
+    """
+
+    return _bulk_validation.get()
 
 
 class BaseGeomModel(BaseModel):
@@ -63,7 +167,7 @@ class Geometry(BaseGeomModel):
         """
 
         counter = 0
-        check = coordinates.copy()
+        check = coordinates
         while type(check) is list:
             check = check[0]
             counter += 1
@@ -86,22 +190,16 @@ class Geometry(BaseGeomModel):
             400, if the coordinates do not match the expected level of nesting.
         """
 
-        match self.type:
-            case "Point":
-                self.coordinates = self.validate_geom(self.coordinates, enclosure=1)
-            case "MultiPoint" | "LineString":
-                self.coordinates = self.validate_geom(self.coordinates, enclosure=2)
-            case "MultiLineString" | "Polygon":
-                self.coordinates = self.validate_geom(self.coordinates, enclosure=3)
-            case "MultiPolygon":
-                self.coordinates = self.validate_geom(self.coordinates, enclosure=4)
-            case _:
-                raise http_exception(
-                    400,
-                    "Input should be a valid Geometry type",
-                    _input=self.coordinates,
-                    _detail={"available_types": geom_types},
-                )
+        if skip_feature_validation():
+            return self
+        if self.type not in geom_nesting:
+            raise http_exception(
+                400,
+                "Input should be a valid Geometry type",
+                _input=self.coordinates,
+                _detail={"available_types": geom_types},
+            )
+        self.coordinates = self.validate_geom(self.coordinates, enclosure=geom_nesting[self.type])
         return self
 
     def as_geom(self) -> BaseGeometry:
@@ -157,6 +255,8 @@ class FixZonePointFeature(Feature):
     @field_validator("properties", mode="after")
     @classmethod
     def validate_properties(cls, value: dict[str, Any]) -> dict[str, Any]:
+        if skip_feature_validation():
+            return value
         if "fixed_zone" not in value:
             raise http_exception(
                 status_code=400,
@@ -165,16 +265,14 @@ class FixZonePointFeature(Feature):
                 _input=value,
             )
         if not isinstance(value["fixed_zone"], TerritoryZone) and not isinstance(value["fixed_zone"], FuncZone):
-            if value["fixed_zone"] not in (
-                list(custom_ter_zones_map_by_name.keys()) + list(scenario_func_zones_map.keys())
-            ):
+            if not is_fixed_zone_key(value["fixed_zone"]):
                 raise http_exception(
                     400,
                     msg="'fixed_zone' property is not valid",
                     _input=value,
                     _detail={
-                        "str": {"available_fixed_zones_names": list(custom_ter_zones_map_by_name.keys())},
-                        "int": {"available_fixed_zones_ids": list(scenario_func_zones_map.keys())},
+                        "str": {"available_fixed_zones_names": available_fixed_zones_names},
+                        "int": {"available_fixed_zones_ids": available_fixed_zones_ids},
                     },
                 )
         return value
@@ -232,6 +330,14 @@ class FeatureCollectionCRS(BaseModel):
 
 
 class FeatureCollection(BaseGeomModel):
+    """
+    FeatureCollection representation for GeoJSON model.
+    Collections are validated in bulk: models are built without per-feature validators, then nesting
+    and properties are checked over the whole collection and geometries are built with shapely array constructors.
+    Any collection failing bulk checks is validated again feature by feature, so errors stay the same.
+    """
+
+    _geometries: np.ndarray | None = None
 
     type: Literal["FeatureCollection"] = Field(examples=["FeatureCollection"])
     bbox: Optional[list[float]] = Field(
@@ -244,6 +350,63 @@ class FeatureCollection(BaseGeomModel):
         description="Coordinate Reference System for the FeatureCollection",
     )
 
+    @classmethod
+    def validate_features_properties(cls, properties: list[dict[str, Any] | None]) -> bool:
+        """
+        Function checks properties of all features in bulk validation. No checks by default.
+        Args:
+            properties (list[dict[str, Any] | None]): Features properties, None for omitted properties.
+        Returns:
+            bool: True if all properties are valid.
+        """
+
+        return True
+
+    def validate_features_in_bulk(self) -> bool:
+        """
+        Function checks geometries nesting and features properties over the whole collection
+        and builds all geometries with shapely array constructors.
+        Returns:
+            bool: True if collection is valid, parsed geometries are stored for as_gdf.
+        """
+
+        geometries = [feature.geometry for feature in self.features]
+        if not geometries or any(
+            get_nesting_depth(geometry.coordinates) != geom_nesting[geometry.type] for geometry in geometries
+        ):
+            return False
+        if not self.validate_features_properties([feature.properties for feature in self.features]):
+            return False
+        try:
+            self._geometries = build_geometries(geometries)
+        except (TypeError, ValueError, shapely.errors.ShapelyError):
+            self._geometries = None
+        return True
+
+    @model_validator(mode="wrap")
+    @classmethod
+    def validate_collection(cls, data: Any, handler: ModelWrapValidatorHandler[Self]) -> Self:
+        """
+        Validating collection in bulk, falling back to feature by feature validation.
+        Returns:
+            Self: validated FeatureCollection.
+        Raises:
+            400, if geometries or properties are not valid.
+        """
+
+        if skip_feature_validation():
+            return handler(data)
+        token = _bulk_validation.set(True)
+        try:
+            collection = handler(data)
+        except ValidationError:
+            collection = None
+        finally:
+            _bulk_validation.reset(token)
+        if collection is not None and collection.validate_features_in_bulk():
+            return collection
+        return handler(data)
+
     def as_dict(self) -> dict:
         return {
             "type": self.type,
@@ -263,6 +426,12 @@ class FeatureCollection(BaseGeomModel):
             gpd.GeoDataFrame: GeoDataFrame representation of the FeatureCollection.
         """
 
+        if self._geometries is not None and len(self._geometries) == len(self.features):
+            rows = [
+                {"geometry": geometry, **(feature.properties or {})}
+                for geometry, feature in zip(self._geometries, self.features)
+            ]
+            return gpd.GeoDataFrame(rows, crs=crs if crs else None)
         if crs:
             return gpd.GeoDataFrame.from_features(self.as_dict(), crs=crs)
         return gpd.GeoDataFrame.from_features(self.as_dict())
@@ -272,6 +441,20 @@ class FixZoneFeatureCollection(FeatureCollection):
 
     features: list[FixZonePointFeature]
 
+    @classmethod
+    def validate_features_properties(cls, properties: list[dict[str, Any] | None]) -> bool:
+        """
+        Function checks 'fixed_zone' property of all features in bulk validation.
+        Args:
+            properties (list[dict[str, Any] | None]): Features properties, None for omitted properties.
+        Returns:
+            bool: True if all features have available fixed zone names or ids.
+        """
+
+        return all(
+            value is None or ("fixed_zone" in value and is_fixed_zone_key(value["fixed_zone"])) for value in properties
+        )
+
 
 class LineStringFeatureCollection(FeatureCollection):
 
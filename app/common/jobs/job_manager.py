@@ -0,0 +1,227 @@
+import asyncio
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Literal
+
+from fastapi import HTTPException
+from loguru import logger
+
+from app.common.exceptions.http_exception import http_exception
+
+JobStatus = Literal["queued", "running", "finished", "failed", "cancelled"]
+
+
+class Job:
+    """
+    Background job representation.
+    Attributes:
+        task_id (str): Unique job ID.
+        owner (str): Authorization scope of job submitter.
+        status (JobStatus): Current job status.
+        result (Any): Job result if finished.
+        error (dict | None): Error status code and detail if failed.
+    """
+
+    def __init__(self, owner: str, factory: Callable[[], Awaitable[Any]]):
+        """
+        Function initializes job.
+        Args:
+            owner (str): Authorization scope of job submitter.
+            factory (Callable[[], Awaitable[Any]]): Async function to run job.
+        """
+
+        self.task_id: str = str(uuid.uuid4())
+        self.owner = owner
+        self.status: JobStatus = "queued"
+        self.result: Any = None
+        self.error: dict | None = None
+        self.created_at: float = time.time()
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self._factory = factory
+        self._task: asyncio.Task | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "task_id": self.task_id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """
+    Manager for running long jobs in background with bounded queue and worker pool.
+    Jobs are owned by the exact token they were submitted with, so after token refresh they are not available.
+    Attributes:
+        workers (int): Number of jobs executed simultaneously.
+        max_queue_size (int): Maximum number of queued jobs.
+        result_ttl (float): Seconds to keep finished jobs and their results.
+        max_finished_jobs (int): Maximum number of kept finished jobs, oldest ones are removed first.
+    """
+
+    def __init__(self, workers: int, max_queue_size: int, result_ttl: float, max_finished_jobs: int = 100):
+        """
+        Function initializes JobManager.
+        Args:
+            workers (int): Number of jobs executed simultaneously.
+            max_queue_size (int): Maximum number of queued jobs.
+            result_ttl (float): Seconds to keep finished jobs and their results.
+            max_finished_jobs (int): Maximum number of kept finished jobs. Defaults to 100.
+        """
+
+        self.workers = workers
+        self.max_queue_size = max_queue_size
+        self.result_ttl = result_ttl
+        self.max_finished_jobs = max_finished_jobs
+        self._jobs: dict[str, Job] = {}
+        self._queue: asyncio.Queue[Job] = asyncio.Queue(maxsize=max_queue_size)
+        self._worker_tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """
+        Function starts workers consuming jobs queue
+        """
+
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        logger.info(f"Started {self.workers} job workers")
+
+    async def close(self) -> None:
+        """
+        Function cancels workers and running jobs
+        """
+
+        for worker_task in self._worker_tasks:
+            worker_task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        logger.info("Stopped job workers")
+
+    async def _worker(self) -> None:
+
+        while True:
+            job = await self._queue.get()
+            try:
+                if job.status == "queued":
+                    await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+
+        job.status = "running"
+        job.started_at = time.time()
+        job._task = asyncio.create_task(job._factory())
+        try:
+            job.result = await job._task
+            job.status = "finished"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            # worker itself is cancelled on shutdown, job task cancelled by user doesn't stop worker
+            if asyncio.current_task().cancelling():
+                job._task.cancel()
+                raise
+        except HTTPException as e:
+            job.status = "failed"
+            job.error = {"status_code": e.status_code, "detail": e.detail}
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.exception(f"Job {job.task_id} failed")
+            job.status = "failed"
+            job.error = {"status_code": 500, "detail": {"msg": "Internal server error", "detail": repr(e)}}
+        finally:
+            job.finished_at = time.time()
+            job._task = None
+            logger.info(f"Job {job.task_id} {job.status}")
+            self._cleanup()
+
+    def _cleanup(self) -> None:
+
+        expire_before = time.time() - self.result_ttl
+        finished = sorted(
+            (job for job in self._jobs.values() if job.finished_at is not None), key=lambda job: job.finished_at
+        )
+        excess = len(finished) - self.max_finished_jobs
+        for i, job in enumerate(finished):
+            if i < excess or job.finished_at < expire_before:
+                del self._jobs[job.task_id]
+
+    def submit(self, owner: str, factory: Callable[[], Awaitable[Any]]) -> Job:
+        """
+        Function adds job to queue.
+        Args:
+            owner (str): Authorization scope of job submitter, job is available only for the same scope.
+            factory (Callable[[], Awaitable[Any]]): Async function to run job.
+        Returns:
+            Job: Queued job.
+        Raises:
+            429, if jobs queue is full.
+        """
+
+        self._cleanup()
+        job = Job(owner, factory)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull as e:
+            raise http_exception(
+                429,
+                "Too many queued generation tasks",
+                _input={"queue_size": self._queue.qsize()},
+                _detail={"max_queue_size": self.max_queue_size},
+            ) from e
+        self._jobs[job.task_id] = job
+        logger.info(f"Job {job.task_id} queued")
+        return job
+
+    def get(self, task_id: str, owner: str) -> Job:
+        """
+        Function returns job by ID for its owner.
+        Args:
+            task_id (str): Job ID.
+            owner (str): Authorization scope of requester.
+        Returns:
+            Job: Requested job.
+        Raises:
+            404, if job does not exist, expired or belongs to another owner.
+        """
+
+        self._cleanup()
+        job = self._jobs.get(task_id)
+        if job is None or job.owner != owner:
+            raise http_exception(404, "Task not found", _input={"task_id": task_id}, _detail={})
+        return job
+
+    def cancel(self, task_id: str, owner: str) -> Job:
+        """
+        Function cancels queued or running job.
+        Running generation thread can't be interrupted, so its result is discarded on completion.
+        Args:
+            task_id (str): Job ID.
+            owner (str): Authorization scope of requester.
+        Returns:
+            Job: Cancelled job.
+        Raises:
+            404, if job does not exist, expired or belongs to another owner.
+        """
+
+        job = self.get(task_id, owner)
+        if job.status == "queued":
+            job.status = "cancelled"
+            job.finished_at = time.time()
+        elif job.status == "running" and job._task is not None:
+            job._task.cancel()
+        return job
+
+    def stats(self) -> dict[str, int]:
+        """
+        Function returns number of jobs by status.
+        Returns:
+            dict[str, int]: Number of jobs by status.
+        """
+
+        counts = {status: 0 for status in JobStatus.__args__}
+        for job in self._jobs.values():
+            counts[job.status] += 1
+        return counts
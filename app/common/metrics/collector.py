@@ -0,0 +1,88 @@
+import os
+from typing import Iterator
+
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
+from prometheus_client.registry import Collector
+
+from app.common.admission.admission_controller import AdmissionController
+from app.common.caching.geodata_cache import GeoDataCache
+from app.common.caching.result_cache import GenerationResultCache
+from app.gen_planner.gen_planner_service import GenPlannerService
+from app.gen_planner.generation_executor import GenerationExecutor, get_rss_bytes
+
+
+class AppMetricsCollector(Collector):
+    """
+    Collector of app state metrics, read on each scrape: running and queued generations,
+    caches hits and misses, app and generation workers memory.
+    """
+
+    def __init__(
+        self,
+        genplanner_service: GenPlannerService,
+        executor: GenerationExecutor,
+        geodata_cache: GeoDataCache,
+        result_caches: dict[str, GenerationResultCache | None],
+        admission_controller: AdmissionController | None = None,
+    ):
+        """
+        Function initializes AppMetricsCollector.
+        Args:
+            genplanner_service (GenPlannerService): Service running generations.
+            executor (GenerationExecutor): Executor running generations.
+            geodata_cache (GeoDataCache): Cache of upstream geodata.
+            result_caches (dict[str, GenerationResultCache | None]): Generation result caches by names.
+            admission_controller (AdmissionController | None): Limiter of simultaneous generations. Defaults to None.
+        """
+
+        self.genplanner_service = genplanner_service
+        self.executor = executor
+        self.geodata_cache = geodata_cache
+        self.result_caches = result_caches
+        self.admission_controller = admission_controller
+
+    def _collect_caches(self) -> Iterator[Metric]:
+
+        hits = CounterMetricFamily("genplanner_cache_hits", "Number of cache hits", labels=["cache"])
+        misses = CounterMetricFamily("genplanner_cache_misses", "Number of cache misses", labels=["cache"])
+        ratio = GaugeMetricFamily("genplanner_cache_hit_ratio", "Share of cache hits in lookups", labels=["cache"])
+        counters = {
+            f"geodata_{source}": (source_stats["hits"], source_stats["misses"])
+            for source, source_stats in self.geodata_cache.stats()["sources"].items()
+        }
+        for name, cache in self.result_caches.items():
+            if cache:
+                stats = cache.stats()
+                counters[name] = (stats["memory_hits"] + stats["disk_hits"], stats["misses"])
+        for name, (cache_hits, cache_misses) in counters.items():
+            hits.add_metric([name], cache_hits)
+            misses.add_metric([name], cache_misses)
+            ratio.add_metric([name], cache_hits / (cache_hits + cache_misses) if cache_hits + cache_misses else 0)
+        yield from (hits, misses, ratio)
+
+    def collect(self) -> Iterator[Metric]:
+
+        yield GaugeMetricFamily(
+            "genplanner_generations_in_flight",
+            "Number of generations running or waiting for admission",
+            value=self.genplanner_service.generations_in_flight,
+        )
+        if self.admission_controller:
+            yield GaugeMetricFamily(
+                "genplanner_generations_queued",
+                "Number of generations waiting for admission",
+                value=self.admission_controller.queued,
+            )
+            yield GaugeMetricFamily(
+                "genplanner_admission_capacity_in_use",
+                "Cost units of admitted generations",
+                value=self.admission_controller.in_use,
+            )
+        yield from self._collect_caches()
+        rss = GaugeMetricFamily(
+            "genplanner_worker_rss_bytes", "Resident set size of app and generation workers", labels=["worker", "pid"]
+        )
+        rss.add_metric(["app", str(os.getpid())], get_rss_bytes())
+        for pid, worker_rss in self.executor.workers_rss.items():
+            rss.add_metric(["generation", str(pid)], worker_rss)
+        yield rss
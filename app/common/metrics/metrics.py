@@ -0,0 +1,83 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+from prometheus_client import Histogram
+
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1200)
+UPSTREAM_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+STAGE_DURATION = Histogram(
+    "genplanner_stage_duration_seconds",
+    "Duration of generation stages",
+    ["stage"],
+    buckets=STAGE_BUCKETS,
+)
+UPSTREAM_REQUEST_DURATION = Histogram(
+    "genplanner_upstream_request_duration_seconds",
+    "Duration of upstream requests by endpoint and response status",
+    ["upstream", "endpoint", "status"],
+    buckets=UPSTREAM_BUCKETS,
+)
+
+_collected_timings = threading.local()
+
+
+def observe_stage(stage: str, duration: float) -> None:
+    """
+    Function records stage duration, or collects it if stage runs under collect_stage_timings.
+    Args:
+        stage (str): Stage name.
+        duration (float): Stage duration in seconds.
+    """
+
+    timings = getattr(_collected_timings, "timings", None)
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + duration
+    else:
+        STAGE_DURATION.labels(stage).observe(duration)
+
+
+@contextmanager
+def timed_stage(stage: str) -> Iterator[None]:
+    """
+    Function measures duration of code block as generation stage.
+    Args:
+        stage (str): Stage name.
+    """
+
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - started_at)
+
+
+def collect_stage_timings(func: Callable, *args: Any) -> tuple[Any, dict[str, float]]:
+    """
+    Function runs function collecting durations of its stages instead of recording them,
+    so stages timed in worker processes can be recorded by app process.
+    Args:
+        func (Callable): Function to run.
+        *args (Any): Function arguments.
+    Returns:
+        tuple[Any, dict[str, float]]: Function result and its stages durations.
+    """
+
+    _collected_timings.timings = {}
+    try:
+        return func(*args), _collected_timings.timings
+    finally:
+        _collected_timings.timings = None
+
+
+def record_stage_timings(timings: dict[str, float]) -> None:
+    """
+    Function records stages durations collected by collect_stage_timings.
+    Args:
+        timings (dict[str, float]): Stages durations in seconds.
+    """
+
+    for stage, duration in timings.items():
+        STAGE_DURATION.labels(stage).observe(duration)
@@ -0,0 +1,97 @@
+import asyncio
+import inspect
+import time
+from typing import Any, Callable, Iterable
+
+from loguru import logger
+
+from app.common.tracing.tracer import trace_span
+
+
+class TaskGraph:
+    """
+    Graph of async or threaded steps, each step is started as soon as all its dependencies are resolved.
+    Dependencies must be added before dependent steps, so graph is always acyclic.
+    Attributes:
+        name (str): Graph name for logs.
+        timings (dict[str, float]): Durations of finished steps in seconds.
+        offsets (dict[str, float]): Start offsets of finished steps from graph start in seconds.
+    """
+
+    def __init__(self, name: str):
+        """
+        Function initializes TaskGraph.
+        Args:
+            name (str): Graph name for logs.
+        """
+
+        self.name = name
+        self.timings: dict[str, float] = {}
+        self.offsets: dict[str, float] = {}
+        self._steps: dict[str, tuple[Callable[..., Any], tuple[str, ...], bool]] = {}
+        self._started_at: float = 0.0
+
+    def add(
+        self, name: str, func: Callable[..., Any], dependencies: Iterable[str] = (), in_thread: bool = False
+    ) -> "TaskGraph":
+        """
+        Function adds step to graph.
+        Args:
+            name (str): Unique step name.
+            func (Callable[..., Any]): Step function, receives dependencies results as positional arguments.
+            Can be a coroutine function or a regular function.
+            dependencies (Iterable[str]): Names of steps to wait for. Defaults to no dependencies.
+            in_thread (bool): Whether to run regular function in thread. Defaults to False.
+        Returns:
+            TaskGraph: The same graph for chaining.
+        Raises:
+            ValueError: If step name is duplicated or dependency is not added yet.
+        """
+
+        dependencies = tuple(dependencies)
+        if name in self._steps:
+            raise ValueError(f"Step {name} is already added to graph {self.name}")
+        unknown = [dependency for dependency in dependencies if dependency not in self._steps]
+        if unknown:
+            raise ValueError(f"Step {name} depends on unknown steps {unknown} in graph {self.name}")
+        self._steps[name] = (func, dependencies, in_thread)
+        return self
+
+    async def _run_step(self, name: str, tasks: dict[str, asyncio.Task]) -> Any:
+
+        func, dependencies, in_thread = self._steps[name]
+        args = [await tasks[dependency] for dependency in dependencies]
+        started_at = time.perf_counter()
+        with trace_span(f"step {name}", graph=self.name, in_thread=in_thread):
+            if in_thread:
+                result = await asyncio.to_thread(func, *args)
+            else:
+                result = func(*args)
+                if inspect.isawaitable(result):
+                    result = await result
+        self.offsets[name] = started_at - self._started_at
+        self.timings[name] = time.perf_counter() - started_at
+        return result
+
+    async def run(self) -> dict[str, Any]:
+        """
+        Function runs all steps concurrently respecting dependencies.
+        If any step fails, other steps are cancelled and the first error is raised.
+        Returns:
+            dict[str, Any]: Steps results by names.
+        """
+
+        self._started_at = time.perf_counter()
+        tasks: dict[str, asyncio.Task] = {}
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                for name in self._steps:
+                    tasks[name] = task_group.create_task(self._run_step(name, tasks), name=f"{self.name}:{name}")
+        except ExceptionGroup as e:
+            raise e.exceptions[0]
+        total = time.perf_counter() - self._started_at
+        steps_timings = ", ".join(
+            f"{name} +{self.offsets[name]:.3f}s {self.timings[name]:.3f}s" for name in self._steps
+        )
+        logger.info(f"Graph {self.name} completed in {total:.3f}s: {steps_timings}")
+        return {name: task.result() for name, task in tasks.items()}
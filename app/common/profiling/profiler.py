@@ -0,0 +1,240 @@
+"""On-demand profiling of generation requests is defined here."""
+
+import re
+import secrets
+import shutil
+import time
+import uuid
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Literal
+
+from fastapi import FastAPI, Request
+from loguru import logger
+from pyinstrument import Profiler
+from pyinstrument.renderers import HTMLRenderer, SpeedscopeRenderer
+from pyinstrument.session import Session
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.common.exceptions.http_exception import http_exception
+
+PROFILE_KEY_HEADER = "X-Profile-Key"
+PROFILE_ID_HEADER = "X-Profile-Id"
+PROFILED_PATH_PATTERN = re.compile(r"/run_func_generation(/only_zones|/binary)?$")
+
+ReportFormat = Literal["html", "speedscope"]
+
+_profiling: ContextVar["ProfilingSession | None"] = ContextVar("profiling", default=None)
+
+
+def profile_call(func: Callable, *args: Any) -> tuple[Any, dict[str, Any]]:
+    """
+    Function runs function under sampling profiler in current thread, used in generation workers.
+    Args:
+        func (Callable): Function to run.
+        *args (Any): Function arguments.
+    Returns:
+        tuple[Any, dict[str, Any]]: Function result and profiler session in JSON format.
+    """
+
+    profiler = Profiler(async_mode="disabled")
+    profiler.start()
+    try:
+        result = func(*args)
+    finally:
+        session = profiler.stop()
+    return result, session.to_json()
+
+
+class ProfilingSession:
+    """
+    Profiling of one request, collecting sessions of worker threads and processes it used.
+    Attributes:
+        profile_id (str): Unique profile ID.
+        worker_sessions (list[Session]): Sessions recorded in generation workers.
+    """
+
+    def __init__(self):
+
+        self.profile_id: str = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.worker_sessions: list[Session] = []
+
+    def add_worker_session(self, session: dict[str, Any]) -> None:
+
+        self.worker_sessions.append(Session.from_json(session))
+
+
+def get_profiling_session() -> ProfilingSession | None:
+    """
+    Function returns profiling of current request.
+    Returns:
+        ProfilingSession | None: Profiling session or None if request is not profiled.
+    """
+
+    return _profiling.get()
+
+
+class ProfileStorage:
+    """
+    Storage of profiler sessions on disk, one directory per profiled request, keeping only newest profiles.
+    Attributes:
+        path (Path): Directory with profiles.
+        max_profiles (int): Number of newest profiles to keep.
+    """
+
+    def __init__(self, path: Path, max_profiles: int):
+        """
+        Function initializes ProfileStorage.
+        Args:
+            path (Path): Directory with profiles.
+            max_profiles (int): Number of newest profiles to keep.
+        """
+
+        self.path = path
+        self.max_profiles = max_profiles
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def save(self, profiling: ProfilingSession, request_session: Session) -> None:
+        """
+        Function saves request and workers sessions and removes oldest profiles above limit.
+        Args:
+            profiling (ProfilingSession): Profiling of request with workers sessions.
+            request_session (Session): Session recorded in event loop while handling request.
+        """
+
+        profile_path = self.path / profiling.profile_id
+        profile_path.mkdir()
+        request_session.save(profile_path / "request.pyisession")
+        for i, session in enumerate(profiling.worker_sessions):
+            session.save(profile_path / f"worker-{i}.pyisession")
+        profiles = sorted(self.path.iterdir(), key=lambda p: p.stat().st_mtime)
+        for old_path in profiles[: max(0, len(profiles) - self.max_profiles)]:
+            shutil.rmtree(old_path, ignore_errors=True)
+        logger.info(f"Saved profile {profiling.profile_id} with {len(profiling.worker_sessions)} worker sessions")
+
+    def list(self) -> list[dict[str, Any]]:
+        """
+        Function lists stored profiles from newest to oldest.
+        Returns:
+            list[dict[str, Any]]: Profile IDs, creation times and sessions names.
+        """
+
+        profiles = sorted(self.path.iterdir(), key=lambda p: p.stat().st_mtime, reverse=True)
+        return [
+            {
+                "profile_id": profile_path.name,
+                "created_at": profile_path.stat().st_mtime,
+                "sessions": sorted(session_path.stem for session_path in profile_path.glob("*.pyisession")),
+            }
+            for profile_path in profiles
+        ]
+
+    def render(self, profile_id: str, session_name: str, report_format: ReportFormat = "html") -> str:
+        """
+        Function renders stored session to report.
+        Args:
+            profile_id (str): Profile ID.
+            session_name (str): Session name, "request" or "worker-{i}".
+            report_format (ReportFormat): "html" for call tree and timeline or "speedscope" for flamegraph.
+            Defaults to "html".
+        Returns:
+            str: Rendered report.
+        Raises:
+            404, if profile or session is not found.
+        """
+
+        session_path = self.path / profile_id / f"{session_name}.pyisession"
+        if session_path.parent.parent != self.path or not session_path.is_file():
+            raise http_exception(
+                404,
+                "Profile session not found",
+                _input={"profile_id": profile_id, "session": session_name},
+                _detail=None,
+            )
+        renderer = HTMLRenderer() if report_format == "html" else SpeedscopeRenderer()
+        return renderer.render(Session.load(session_path))
+
+
+def verify_profile_key(request: Request) -> None:
+    """
+    Function checks X-Profile-Key header against PROFILING_KEY config value.
+    Args:
+        request (Request): Incoming request.
+    Raises:
+        403, if profiling is disabled or key does not match.
+    """
+
+    profiling_key = request.app.state.profiling_key
+    key = request.headers.get(PROFILE_KEY_HEADER)
+    if not profiling_key or not key or not secrets.compare_digest(key.encode(), profiling_key.encode()):
+        raise http_exception(
+            403,
+            "Profiling is disabled or profile key is invalid",
+            _input={"header": PROFILE_KEY_HEADER},
+            _detail=None,
+        )
+
+
+class ProfilingMiddleware(BaseHTTPMiddleware):  # pylint: disable=too-few-public-methods
+    """Profile generation request with X-Profile-Key header, including generation workers it runs.
+    Only one request is profiled at a time, profile ID is returned in X-Profile-Id header
+    and report is saved to app.state.profile_storage after response body is sent.
+    Attributes:
+           app (FastAPI): The FastAPI application instance.
+    """
+
+    def __init__(self, app: FastAPI):
+        """
+        Profiling middleware init function.
+        Args:
+            app (FastAPI): The FastAPI application instance.
+        """
+
+        super().__init__(app)
+        self._active = False
+
+    async def dispatch(self, request: Request, call_next):
+        """
+        Dispatch function profiling request
+        Args:
+            request (Request): The incoming request object.
+            call_next: function to extract.
+        """
+
+        if PROFILE_KEY_HEADER not in request.headers or not PROFILED_PATH_PATTERN.search(request.url.path):
+            return await call_next(request)
+        verify_profile_key(request)
+        if self._active:
+            raise http_exception(409, "Another request is being profiled", _input=None, _detail=None)
+        self._active = True
+        profiling = ProfilingSession()
+        token = _profiling.set(profiling)
+        profiler = Profiler(async_mode="enabled")
+        profiler.start()
+
+        def finish() -> None:
+            self._active = False
+            try:
+                request.app.state.profile_storage.save(profiling, profiler.stop())
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.error(f"Could not save profile {profiling.profile_id}: {repr(e)}")
+
+        try:
+            response = await call_next(request)
+        except BaseException:
+            finish()
+            raise
+        finally:
+            _profiling.reset(token)
+        body_iterator = response.body_iterator
+
+        async def profiled_body():
+            try:
+                async for chunk in body_iterator:
+                    yield chunk
+            finally:
+                finish()
+
+        response.body_iterator = profiled_body()
+        response.headers[PROFILE_ID_HEADER] = profiling.profile_id
+        return response
@@ -0,0 +1,117 @@
+import io
+
+import geopandas as gpd
+import numpy as np
+import pyogrio
+import shapely
+
+from app.common.exceptions.http_exception import http_exception
+
+POLYGONAL_TYPE_IDS = [3, 6]
+
+TERRITORY_MEDIA_TYPES = {
+    "application/wkb": "wkb",
+    "application/vnd.apache.parquet": "geoparquet",
+    "application/x-parquet": "geoparquet",
+    "application/flatgeobuf": "flatgeobuf",
+    "application/vnd.flatgeobuf": "flatgeobuf",
+}
+
+
+def _read_wkb(content: bytes) -> gpd.GeoDataFrame:
+    """
+    Function decodes one WKB geometry (binary or hex) to GeoDataFrame in EPSG:4326.
+    Args:
+        content (bytes): WKB content.
+    Returns:
+        gpd.GeoDataFrame: GeoDataFrame with one geometry.
+    """
+
+    if content[:1] == b"0":
+        content = content.decode().strip()
+    geometry = shapely.from_wkb(np.array([content], dtype=object))
+    return gpd.GeoDataFrame(geometry=geometry, crs=4326)
+
+
+def _read_geoparquet(content: bytes) -> gpd.GeoDataFrame:
+    """
+    Function decodes GeoParquet file content to GeoDataFrame.
+    Args:
+        content (bytes): GeoParquet file content.
+    Returns:
+        gpd.GeoDataFrame: Decoded GeoDataFrame.
+    """
+
+    return gpd.read_parquet(io.BytesIO(content))
+
+
+def _read_flatgeobuf(content: bytes) -> gpd.GeoDataFrame:
+    """
+    Function decodes FlatGeobuf file content to GeoDataFrame.
+    Args:
+        content (bytes): FlatGeobuf file content.
+    Returns:
+        gpd.GeoDataFrame: Decoded GeoDataFrame.
+    """
+
+    return pyogrio.read_dataframe(io.BytesIO(content))
+
+
+TERRITORY_READERS = {
+    "wkb": _read_wkb,
+    "geoparquet": _read_geoparquet,
+    "flatgeobuf": _read_flatgeobuf,
+}
+
+
+def read_territory(content: bytes, media_type: str | None) -> gpd.GeoDataFrame:
+    """
+    Function decodes binary territory upload to GeoDataFrame in EPSG:4326.
+    Geometries are decoded and checked with vectorized shapely functions, without per-vertex validation.
+    Args:
+        content (bytes): Request body.
+        media_type (str | None): Content-Type of request body.
+    Returns:
+        gpd.GeoDataFrame: Territory with Polygon and MultiPolygon geometries.
+    Raises:
+        415, if media type is not supported.
+        400, if content can't be decoded or contains no polygonal geometries.
+    """
+
+    media_type = (media_type or "").split(";")[0].strip().lower()
+    territory_format = TERRITORY_MEDIA_TYPES.get(media_type)
+    if not territory_format:
+        raise http_exception(
+            415,
+            "Unsupported territory media type",
+            _input=media_type,
+            _detail={"available_types": list(TERRITORY_MEDIA_TYPES)},
+        )
+    if not content:
+        raise http_exception(400, "Territory content is empty", _input=media_type, _detail={})
+    try:
+        gdf = TERRITORY_READERS[territory_format](content)
+    except Exception as e:
+        raise http_exception(
+            400,
+            "Couldn't decode territory",
+            _input=media_type,
+            _detail={"error": repr(e)},
+        ) from e
+
+    geometry = gdf.geometry.values
+    if len(gdf) == 0 or shapely.is_empty(geometry).all():
+        raise http_exception(400, "Territory contains no geometries", _input=media_type, _detail={})
+    type_ids = shapely.get_type_id(geometry)
+    if not np.isin(type_ids, POLYGONAL_TYPE_IDS).all():
+        raise http_exception(
+            400,
+            "Input should be a valid Polygon or MultiPolygon",
+            _input=media_type,
+            _detail={"geometry_types": sorted(set(gdf.geom_type.dropna()))},
+        )
+    if gdf.crs is None:
+        gdf = gdf.set_crs(4326)
+    elif gdf.crs.to_epsg() != 4326:
+        gdf = gdf.to_crs(4326)
+    return gdf
@@ -0,0 +1,116 @@
+import io
+from typing import Any
+
+import geopandas as gpd
+import orjson
+import pandas as pd
+import pyarrow as pa
+import pyogrio
+
+from .geojson_writer import ORJSON_OPTIONS, _default
+
+
+def _normalize_value(value: Any) -> Any:
+    """
+    Function converts nested and non-scalar values to JSON strings, so columns can be stored in binary formats.
+    Args:
+        value (Any): Cell value.
+    Returns:
+        Any: Value as is for None, str, bool, int and float, JSON string otherwise.
+    """
+
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    return orjson.dumps(value, default=_default, option=ORJSON_OPTIONS).decode()
+
+
+def form_layers_gdf(layers: dict[str, gpd.GeoDataFrame | pd.DataFrame]) -> gpd.GeoDataFrame:
+    """
+    Function combines named GeoDataFrames to one GeoDataFrame with "layer" column holding layer name.
+    Object columns are normalized to strings, so result can be written to binary formats.
+    Args:
+        layers (dict[str, gpd.GeoDataFrame | pd.DataFrame]): Frames by names, e.g. zones and roads.
+    Returns:
+        gpd.GeoDataFrame: Combined GeoDataFrame in EPSG:4326.
+    """
+
+    frames = []
+    for name, gdf in layers.items():
+        if getattr(gdf, "active_geometry_name", None) is None:
+            continue
+        frame = gdf.to_crs(4326).reset_index(drop=True)
+        if frame.active_geometry_name != "geometry":
+            frame = frame.rename_geometry("geometry")
+        frame.insert(0, "layer", name)
+        frames.append(frame)
+    if not frames:
+        return gpd.GeoDataFrame({"layer": pd.Series(dtype=str)}, geometry=gpd.GeoSeries(crs=4326), crs=4326)
+    combined = gpd.GeoDataFrame(pd.concat(frames, ignore_index=True), geometry="geometry", crs=4326)
+    for column in combined.columns:
+        if column != "geometry" and combined[column].dtype == object:
+            combined[column] = combined[column].map(_normalize_value).astype("string")
+    return combined
+
+
+def encode_geoparquet(gdf: gpd.GeoDataFrame) -> bytes:
+    """
+    Function encodes GeoDataFrame to GeoParquet bytes.
+    Args:
+        gdf (gpd.GeoDataFrame): Frame to encode.
+    Returns:
+        bytes: GeoParquet file content.
+    """
+
+    buffer = io.BytesIO()
+    gdf.to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+
+def encode_flatgeobuf(gdf: gpd.GeoDataFrame) -> bytes:
+    """
+    Function encodes GeoDataFrame to FlatGeobuf bytes with spatial index.
+    Args:
+        gdf (gpd.GeoDataFrame): Frame to encode, may contain mixed geometry types.
+    Returns:
+        bytes: FlatGeobuf file content.
+    """
+
+    buffer = io.BytesIO()
+    pyogrio.write_dataframe(gdf, buffer, driver="FlatGeobuf", geometry_type="Unknown")
+    return buffer.getvalue()
+
+
+def encode_arrow_ipc(gdf: gpd.GeoDataFrame) -> bytes:
+    """
+    Function encodes GeoDataFrame to Arrow IPC stream bytes with geoarrow.wkb geometry column.
+    Args:
+        gdf (gpd.GeoDataFrame): Frame to encode.
+    Returns:
+        bytes: Arrow IPC stream content.
+    """
+
+    table = pa.table(gdf.to_arrow(index=False, geometry_encoding="WKB"))
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+BINARY_ENCODERS = {
+    "geoparquet": encode_geoparquet,
+    "flatgeobuf": encode_flatgeobuf,
+    "arrow": encode_arrow_ipc,
+}
+
+
+def encode_layers(layers: dict[str, gpd.GeoDataFrame | pd.DataFrame], result_format: str) -> bytes:
+    """
+    Function encodes named GeoDataFrames to one binary table in the requested format.
+    Args:
+        layers (dict[str, gpd.GeoDataFrame | pd.DataFrame]): Frames by names, e.g. zones and roads.
+        result_format (str): One of "geoparquet", "flatgeobuf" or "arrow".
+    Returns:
+        bytes: Encoded table with "layer" column.
+    """
+
+    return BINARY_ENCODERS[result_format](form_layers_gdf(layers))
@@ -0,0 +1,113 @@
+import zlib
+from typing import Iterator, Literal, Protocol
+
+import brotli
+import zstandard
+from fastapi import Request
+
+ContentEncoding = Literal["zstd", "br", "gzip", "identity"]
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+ZSTD_LEVEL = 3
+AVAILABLE_ENCODINGS: list[ContentEncoding] = ["zstd", "br", "gzip"]
+
+
+class Compressor(Protocol):
+
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+class _BrotliCompressor:
+
+    def __init__(self) -> None:
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+def parse_accept_encoding(accept_encoding: str | None) -> ContentEncoding:
+    """
+    Function selects content encoding from Accept-Encoding header by quality values,
+    equal values are resolved by server preference: zstd, br, gzip.
+    Args:
+        accept_encoding (str | None): Accept-Encoding header value.
+    Returns:
+        ContentEncoding: Selected encoding, "identity" if nothing supported is accepted.
+    """
+
+    if not accept_encoding:
+        return "identity"
+    qualities: dict[str, float] = {}
+    for coding in accept_encoding.split(","):
+        name, *params = [part.strip() for part in coding.split(";")]
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        qualities[name.lower()] = quality
+    candidates = [
+        (-qualities.get(encoding, qualities.get("*", 0.0)), position, encoding)
+        for position, encoding in enumerate(AVAILABLE_ENCODINGS)
+    ]
+    candidates = [candidate for candidate in candidates if candidate[0] < 0]
+    if not candidates:
+        return "identity"
+    return min(candidates)[2]
+
+
+async def negotiate_content_encoding(request: Request) -> ContentEncoding:
+    """
+    Function resolves response content encoding from Accept-Encoding header
+    """
+
+    return parse_accept_encoding(request.headers.get("accept-encoding"))
+
+
+def get_compressor(encoding: ContentEncoding) -> Compressor | None:
+    """
+    Function creates streaming compressor for the content encoding.
+    Args:
+        encoding (ContentEncoding): Content encoding.
+    Returns:
+        Compressor | None: Compressor object, None for identity encoding.
+    """
+
+    match encoding:
+        case "zstd":
+            return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+        case "br":
+            return _BrotliCompressor()
+        case "gzip":
+            return zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    return None
+
+
+def iter_compressed(chunks: Iterator[bytes], encoding: ContentEncoding) -> Iterator[bytes]:
+    """
+    Function compresses stream of chunks with the content encoding.
+    Args:
+        chunks (Iterator[bytes]): Source chunks.
+        encoding (ContentEncoding): Content encoding.
+    Yields:
+        bytes: Compressed chunks, empty compressor outputs are skipped.
+    """
+
+    compressor = get_compressor(encoding)
+    if compressor is None:
+        yield from chunks
+        return
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
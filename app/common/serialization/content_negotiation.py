@@ -0,0 +1,83 @@
+from typing import Literal, Optional
+
+from fastapi import Query, Request
+
+ResultFormat = Literal["geojson", "geoparquet", "flatgeobuf", "arrow"]
+
+RESULT_MEDIA_TYPES: dict[ResultFormat, str] = {
+    "geojson": "application/json",
+    "geoparquet": "application/vnd.apache.parquet",
+    "flatgeobuf": "application/flatgeobuf",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+RESULT_FILE_EXTENSIONS: dict[ResultFormat, str] = {
+    "geojson": "json",
+    "geoparquet": "parquet",
+    "flatgeobuf": "fgb",
+    "arrow": "arrow",
+}
+
+_ACCEPTED_MEDIA_TYPES: dict[str, ResultFormat] = {
+    "application/json": "geojson",
+    "application/geo+json": "geojson",
+    "application/vnd.apache.parquet": "geoparquet",
+    "application/x-parquet": "geoparquet",
+    "application/flatgeobuf": "flatgeobuf",
+    "application/vnd.flatgeobuf": "flatgeobuf",
+    "application/vnd.apache.arrow.stream": "arrow",
+}
+
+binary_result_responses = {
+    200: {
+        "description": "Generation result. GeoJSON by default, binary formats contain zones and roads "
+        "in one table distinguished by 'layer' column.",
+        "content": {media_type: {} for media_type in RESULT_MEDIA_TYPES.values() if media_type != "application/json"},
+    }
+}
+
+
+def parse_accept_header(accept: str | None) -> ResultFormat:
+    """
+    Function selects result format with the highest quality value from Accept header.
+    Args:
+        accept (str | None): Accept header value.
+    Returns:
+        ResultFormat: Preferred supported format, "geojson" if header is missing or has no supported types.
+    """
+
+    if not accept:
+        return "geojson"
+    candidates = []
+    for position, media_range in enumerate(accept.split(",")):
+        media_type, *params = [part.strip() for part in media_range.split(";")]
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        result_format = _ACCEPTED_MEDIA_TYPES.get(media_type.lower())
+        if result_format and quality > 0:
+            candidates.append((-quality, position, result_format))
+    if not candidates:
+        return "geojson"
+    return min(candidates)[2]
+
+
+async def negotiate_result_format(
+    request: Request,
+    result_format: Optional[ResultFormat] = Query(
+        default=None,
+        alias="format",
+        description="Result format. Overrides Accept header, GeoJSON by default.",
+    ),
+) -> ResultFormat:
+    """
+    Function resolves generation result format from "format" query parameter or Accept header
+    """
+
+    if result_format:
+        return result_format
+    return parse_accept_header(request.headers.get("accept"))
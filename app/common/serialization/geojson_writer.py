@@ -0,0 +1,130 @@
+from typing import Any, Iterator
+
+import geopandas as gpd
+import numpy as np
+import orjson
+import pandas as pd
+import shapely
+
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+FEATURES_CHUNK_SIZE = 1000
+
+
+def _default(value: Any) -> Any:
+    """
+    Function converts values unsupported by orjson to JSON-serializable ones.
+    Args:
+        value (Any): Value to convert.
+    Returns:
+        Any: None for missing values, python scalar for numpy scalars, string representation otherwise.
+    """
+
+    if value is pd.NA or value is pd.NaT:
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def form_features(gdf: gpd.GeoDataFrame | pd.DataFrame) -> list[dict[str, Any]]:
+    """
+    Function forms GeoJSON features ready for orjson encoding from GeoDataFrame rows.
+    Geometries are encoded with vectorized shapely GeoJSON writer and embedded as raw JSON fragments.
+    Features layout matches GeoDataFrame.to_json output.
+    Args:
+        gdf (gpd.GeoDataFrame | pd.DataFrame): Frame to encode. Frame without active geometry gets null geometries.
+    Returns:
+        list[dict[str, Any]]: Features with pre-encoded geometries.
+    """
+
+    geometry_name = getattr(gdf, "active_geometry_name", None)
+    if geometry_name is not None:
+        geometries = shapely.to_geojson(gdf.geometry.values)
+        properties = gdf.drop(columns=geometry_name)
+    else:
+        geometries = [None] * len(gdf)
+        properties = gdf
+    return [
+        {
+            "id": str(feature_id),
+            "type": "Feature",
+            "properties": feature_properties,
+            "geometry": orjson.Fragment(geometry) if geometry is not None else None,
+        }
+        for feature_id, feature_properties, geometry in zip(
+            gdf.index, properties.to_dict("records"), geometries, strict=True
+        )
+    ]
+
+
+def encode_feature_collection(gdf: gpd.GeoDataFrame | pd.DataFrame) -> bytes:
+    """
+    Function encodes GeoDataFrame to GeoJSON FeatureCollection bytes.
+    Args:
+        gdf (gpd.GeoDataFrame | pd.DataFrame): Frame to encode.
+    Returns:
+        bytes: Encoded FeatureCollection.
+    """
+
+    return orjson.dumps(
+        {"type": "FeatureCollection", "features": form_features(gdf)}, default=_default, option=ORJSON_OPTIONS
+    )
+
+
+def encode_feature_collections(layers: dict[str, gpd.GeoDataFrame | pd.DataFrame]) -> bytes:
+    """
+    Function encodes named GeoDataFrames to JSON object with FeatureCollection for each name.
+    Args:
+        layers (dict[str, gpd.GeoDataFrame | pd.DataFrame]): Frames to encode by names, e.g. zones and roads.
+    Returns:
+        bytes: Encoded JSON object.
+    """
+
+    return (
+        b"{"
+        + b",".join(orjson.dumps(name) + b":" + encode_feature_collection(gdf) for name, gdf in layers.items())
+        + b"}"
+    )
+
+
+def iter_feature_collections(
+    layers: dict[str, gpd.GeoDataFrame | pd.DataFrame], chunk_size: int = FEATURES_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Function encodes named GeoDataFrames to the same JSON object as encode_feature_collections, chunk by chunk.
+    Only one chunk of features is encoded at a time.
+    Args:
+        layers (dict[str, gpd.GeoDataFrame | pd.DataFrame]): Frames to encode by names, e.g. zones and roads.
+        chunk_size (int): Number of features in one chunk. Defaults to 1000.
+    Yields:
+        bytes: Encoded JSON object parts.
+    """
+
+    for layer_index, (name, gdf) in enumerate(layers.items()):
+        separator = b"," if layer_index else b"{"
+        yield separator + orjson.dumps(name) + b':{"type":"FeatureCollection","features":['
+        for start in range(0, len(gdf), chunk_size):
+            chunk = orjson.dumps(
+                form_features(gdf.iloc[start : start + chunk_size]), default=_default, option=ORJSON_OPTIONS
+            )
+            yield (b"," if start else b"") + chunk[1:-1]
+        yield b"]}"
+    yield b"}" if layers else b"{}"
+
+
+def iter_grouped_feature_collections(
+    groups: dict[str, dict[str, gpd.GeoDataFrame | pd.DataFrame]], chunk_size: int = FEATURES_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Function encodes groups of named GeoDataFrames to JSON object of iter_feature_collections objects by group names.
+    Args:
+        groups (dict[str, dict[str, gpd.GeoDataFrame | pd.DataFrame]]): Frames to encode by group and layer names.
+        chunk_size (int): Number of features in one chunk. Defaults to 1000.
+    Yields:
+        bytes: Encoded JSON object parts.
+    """
+
+    for group_index, (group_name, layers) in enumerate(groups.items()):
+        yield (b"," if group_index else b"{") + orjson.dumps(group_name) + b":"
+        yield from iter_feature_collections(layers, chunk_size)
+    yield b"}" if groups else b"{}"
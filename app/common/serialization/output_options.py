@@ -0,0 +1,50 @@
+import geopandas as gpd
+import numpy as np
+import shapely
+
+POLYGONAL_TYPE_IDS = [3, 6]
+
+
+def apply_output_options(
+    gdf: gpd.GeoDataFrame,
+    precision: int | None = None,
+    simplify_tolerance: float | None = None,
+    min_area: float | None = None,
+    drop_empty: bool = False,
+) -> gpd.GeoDataFrame:
+    """
+    Function prepares GeoDataFrame for output: simplifies geometries, drops empty geometries and small polygons
+    and rounds coordinates. Simplification and area filter are done in local UTM projection.
+    Args:
+        gdf (gpd.GeoDataFrame): GeoDataFrame to prepare.
+        precision (int | None): Number of decimal digits kept in output coordinates.
+        simplify_tolerance (float | None): Topology preserving simplification tolerance in meters.
+        min_area (float | None): Minimum area of polygons in square meters, lines and points are kept.
+        drop_empty (bool): Whether to drop rows with empty or missing geometries.
+    Returns:
+        gpd.GeoDataFrame: Prepared copy of GeoDataFrame in its original CRS.
+    """
+
+    if getattr(gdf, "active_geometry_name", None) is None or gdf.empty:
+        return gdf
+    geometries = gdf.geometry.values
+    keep = np.ones(len(gdf), dtype=bool)
+
+    if (simplify_tolerance or min_area) and gdf.crs is not None:
+        local_crs = gdf.estimate_utm_crs()
+        local_geometries = gdf.geometry.to_crs(local_crs).values
+        if simplify_tolerance:
+            local_geometries = shapely.simplify(local_geometries, simplify_tolerance, preserve_topology=True)
+            geometries = gpd.GeoSeries(local_geometries, crs=local_crs).to_crs(gdf.crs).values
+        if min_area:
+            is_polygonal = np.isin(shapely.get_type_id(local_geometries), POLYGONAL_TYPE_IDS)
+            keep &= ~(is_polygonal & (shapely.area(local_geometries) < min_area))
+
+    if drop_empty:
+        keep &= ~(shapely.is_missing(geometries) | shapely.is_empty(geometries))
+    if precision is not None:
+        geometries = shapely.transform(geometries, lambda coords: np.round(coords, precision))
+
+    result = gdf.copy()
+    result[gdf.active_geometry_name] = geometries
+    return result[keep]
@@ -0,0 +1,368 @@
+import asyncio
+import os
+import re
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from pathlib import Path
+from typing import Any, Iterator, Literal, Protocol
+
+import aiohttp
+import orjson
+from loguru import logger
+
+SpanKind = Literal["internal", "server", "client"]
+
+TRACEPARENT_HEADER = "traceparent"
+TRACEPARENT_PATTERN = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+OTLP_SPAN_KINDS = {"internal": 1, "server": 2, "client": 3}
+
+_current_span: ContextVar["Span | None"] = ContextVar("current_span", default=None)
+
+
+class Span:
+    """
+    Timed operation of trace.
+    Attributes:
+        name (str): Operation name.
+        trace_id (str): 32 hex digits trace ID shared by all spans of trace.
+        span_id (str): 16 hex digits span ID.
+        parent_id (str | None): Parent span ID, None for root span.
+        kind (SpanKind): Span kind.
+        attributes (dict[str, Any]): Span attributes.
+        start_ns (int): Start time in nanoseconds since epoch.
+        end_ns (int | None): End time in nanoseconds since epoch, None if span is not ended.
+        error (str | None): Error representation if operation failed.
+    """
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        parent: "Span | None" = None,
+        kind: SpanKind = "internal",
+        attributes: dict[str, Any] | None = None,
+        trace_id: str | None = None,
+        parent_id: str | None = None,
+    ):
+
+        self._tracer = tracer
+        self.name = name
+        self.trace_id = parent.trace_id if parent else trace_id or os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else parent_id
+        self.kind = kind
+        self.attributes: dict[str, Any] = dict(attributes or {})
+        self.start_ns = time.time_ns()
+        self.end_ns: int | None = None
+        self.error: str | None = None
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def set_attributes(self, **attributes: Any) -> None:
+
+        self.attributes.update(attributes)
+
+    def record_error(self, error: BaseException) -> None:
+
+        self.error = repr(error)
+
+    def end(self) -> None:
+        """
+        Function ends span and passes it to tracer export queue, ending span twice has no effect
+        """
+
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        self._tracer.on_end(self)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration": (self.end_ns - self.start_ns) / 1e9,
+            "status": "error" if self.error else "ok",
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class SpanExporter(Protocol):
+    async def export(self, spans: list[Span]) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+class JsonLinesSpanExporter:
+    """
+    Exporter appending spans to local file, one JSON object per line.
+    Attributes:
+        path (Path): Traces file path.
+    """
+
+    def __init__(self, path: Path):
+
+        self.path = path
+
+    def _write(self, lines: bytes) -> None:
+
+        with open(self.path, "ab") as f:
+            f.write(lines)
+
+    async def export(self, spans: list[Span]) -> None:
+
+        lines = b"".join(orjson.dumps(span.as_dict(), default=str) + b"\n" for span in spans)
+        await asyncio.to_thread(self._write, lines)
+
+    async def close(self) -> None:
+        return None
+
+
+class OtlpHttpSpanExporter:
+    """
+    Exporter sending spans to OTLP-compatible collector over HTTP with JSON encoding.
+    Attributes:
+        endpoint (str): Collector traces url, e.g. http://collector:4318/v1/traces.
+        service_name (str): Service name resource attribute.
+    """
+
+    def __init__(self, endpoint: str, service_name: str, timeout: float = 10.0):
+
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session: aiohttp.ClientSession | None = None
+
+    @staticmethod
+    def _form_attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+
+        result = []
+        for key, value in attributes.items():
+            if isinstance(value, bool):
+                otlp_value = {"boolValue": value}
+            elif isinstance(value, int):
+                otlp_value = {"intValue": str(value)}
+            elif isinstance(value, float):
+                otlp_value = {"doubleValue": value}
+            else:
+                otlp_value = {"stringValue": str(value)}
+            result.append({"key": key, "value": otlp_value})
+        return result
+
+    def _form_span(self, span: Span) -> dict[str, Any]:
+
+        otlp_span = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": OTLP_SPAN_KINDS[span.kind],
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": self._form_attributes(span.attributes),
+            "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+        }
+        if span.parent_id:
+            otlp_span["parentSpanId"] = span.parent_id
+        return otlp_span
+
+    async def export(self, spans: list[Span]) -> None:
+
+        if not self._session or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=self.timeout)
+        payload = {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": self._form_attributes({"service.name": self.service_name})},
+                    "scopeSpans": [{"scope": {"name": "genplanner"}, "spans": [self._form_span(s) for s in spans]}],
+                }
+            ]
+        }
+        async with self._session.post(
+            self.endpoint, data=orjson.dumps(payload), headers={"Content-Type": "application/json"}
+        ) as response:
+            if response.status >= 400:
+                logger.warning(f"OTLP collector responded with status {response.status} to {len(spans)} spans")
+
+    async def close(self) -> None:
+
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+
+class Tracer:
+    """
+    Tracer keeping current span in context and exporting ended spans in batches in background.
+    Attributes:
+        exporter (SpanExporter): Spans exporter.
+        flush_interval (float): Seconds between exports.
+        max_queue_size (int): Maximum number of ended spans waiting for export, oldest spans are dropped.
+    """
+
+    def __init__(self, exporter: SpanExporter, flush_interval: float = 5.0, max_queue_size: int = 10000):
+        """
+        Function initializes Tracer.
+        Args:
+            exporter (SpanExporter): Spans exporter.
+            flush_interval (float): Seconds between exports. Defaults to 5.
+            max_queue_size (int): Maximum number of ended spans waiting for export. Defaults to 10000.
+        """
+
+        self.exporter = exporter
+        self.flush_interval = flush_interval
+        self._queue: deque[Span] = deque(maxlen=max_queue_size)
+        self._flush_task: asyncio.Task | None = None
+
+    def on_end(self, span: Span) -> None:
+
+        self._queue.append(span)
+
+    async def flush(self) -> None:
+        """
+        Function exports all ended spans
+        """
+
+        spans = []
+        while self._queue:
+            spans.append(self._queue.popleft())
+        if not spans:
+            return
+        try:
+            await self.exporter.export(spans)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning(f"Could not export {len(spans)} spans: {repr(e)}")
+
+    async def _flush_periodically(self) -> None:
+
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def start(self) -> None:
+        """
+        Function starts background export of spans
+        """
+
+        self._flush_task = asyncio.create_task(self._flush_periodically())
+
+    async def close(self) -> None:
+        """
+        Function stops background export, exporting remaining spans
+        """
+
+        if self._flush_task:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+        await self.flush()
+        await self.exporter.close()
+
+
+_tracer: Tracer | None = None
+
+
+def set_tracer(tracer: Tracer | None) -> None:
+    """
+    Function sets tracer used by trace_span and start_span, None disables tracing.
+    Args:
+        tracer (Tracer | None): Tracer instance.
+    """
+
+    global _tracer  # pylint: disable=global-statement
+    _tracer = tracer
+
+
+def set_current_span(span: Span) -> Token:
+    """
+    Function makes span current in context.
+    Args:
+        span (Span): Span to make current.
+    Returns:
+        Token: Token to restore previous span with reset_current_span.
+    """
+
+    return _current_span.set(span)
+
+
+def reset_current_span(token: Token) -> None:
+    """
+    Function restores span which was current before set_current_span.
+    Args:
+        token (Token): Token returned by set_current_span.
+    """
+
+    _current_span.reset(token)
+
+
+def get_current_span() -> Span | None:
+    """
+    Function returns span of current context.
+    Returns:
+        Span | None: Current span, None if tracing is disabled or there is no span.
+    """
+
+    return _current_span.get()
+
+
+def start_span(
+    name: str, kind: SpanKind = "internal", traceparent: str | None = None, **attributes: Any
+) -> Span | None:
+    """
+    Function starts span, child of current span, without making it current. Span should be ended with Span.end.
+    Args:
+        name (str): Operation name.
+        kind (SpanKind): Span kind. Defaults to "internal".
+        traceparent (str | None): W3C traceparent to continue trace of, used if there is no current span.
+        **attributes (Any): Span attributes.
+    Returns:
+        Span | None: Started span, None if tracing is disabled.
+    """
+
+    if _tracer is None:
+        return None
+    parent = _current_span.get()
+    match = TRACEPARENT_PATTERN.match(traceparent) if traceparent and parent is None else None
+    return Span(
+        _tracer,
+        name,
+        parent,
+        kind,
+        attributes,
+        trace_id=match.group(1) if match else None,
+        parent_id=match.group(2) if match else None,
+    )
+
+
+@contextmanager
+def trace_span(name: str, kind: SpanKind = "internal", **attributes: Any) -> Iterator[Span | None]:
+    """
+    Function traces code block as span, current while block runs. Exceptions are recorded as span error.
+    Args:
+        name (str): Operation name.
+        kind (SpanKind): Span kind. Defaults to "internal".
+        **attributes (Any): Span attributes.
+    Yields:
+        Span | None: Current span, None if tracing is disabled.
+    """
+
+    span = start_span(name, kind, **attributes)
+    if span is None:
+        yield None
+        return
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.record_error(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        span.end()
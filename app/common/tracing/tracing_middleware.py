@@ -0,0 +1,70 @@
+"""Request tracing middleware is defined here."""
+
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from .tracer import TRACEPARENT_HEADER, reset_current_span, set_current_span, start_span
+
+TRACE_ID_HEADER = "X-Trace-Id"
+
+
+class TracingMiddleware(BaseHTTPMiddleware):  # pylint: disable=too-few-public-methods
+    """Start root span for each request, continuing trace from traceparent header if it is sent.
+    Span ends after response body is sent, trace ID is returned in X-Trace-Id header.
+    Attributes:
+           app (FastAPI): The FastAPI application instance.
+    """
+
+    def __init__(self, app: FastAPI):
+        """
+        Tracing middleware init function.
+        Args:
+            app (FastAPI): The FastAPI application instance.
+        """
+
+        super().__init__(app)
+
+    async def dispatch(self, request: Request, call_next):
+        """
+        Dispatch function tracing request
+        Args:
+            request (Request): The incoming request object.
+            call_next: function to extract.
+        """
+
+        span = start_span(
+            f"{request.method} {request.url.path}",
+            "server",
+            traceparent=request.headers.get(TRACEPARENT_HEADER),
+            **{"http.method": request.method, "http.target": request.url.path},
+        )
+        if span is None:
+            return await call_next(request)
+        token = set_current_span(span)
+        try:
+            response = await call_next(request)
+        except BaseException as e:
+            span.record_error(e)
+            span.end()
+            raise
+        finally:
+            reset_current_span(token)
+        route = request.scope.get("route")
+        if route is not None:
+            span.name = f"{request.method} {route.path}"
+        span.set_attributes(**{"http.status_code": response.status_code})
+        body_iterator = response.body_iterator
+
+        async def traced_body():
+            size = 0
+            try:
+                async for chunk in body_iterator:
+                    size += len(chunk)
+                    yield chunk
+            finally:
+                span.set_attributes(**{"http.response_bytes": size})
+                span.end()
+
+        response.body_iterator = traced_body()
+        response.headers[TRACE_ID_HEADER] = span.trace_id
+        return response
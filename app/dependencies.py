@@ -1,6 +1,10 @@
 from fastapi import Request
 from iduconfig import Config
 
+from app.common.caching.geodata_cache import GeoDataCache
+from app.common.caching.result_cache import GenerationResultCache
+from app.common.jobs.job_manager import JobManager
+from app.common.profiling.profiler import ProfileStorage
 from app.gen_planner.gen_planner_service import GenPlannerService
 
 
@@ -16,3 +20,28 @@ def get_genplanner_service(request: Request) -> GenPlannerService:
 
 def get_log_path(request: Request):
     return request.app.state.log_path
+
+
+def get_geodata_cache(request: Request) -> GeoDataCache:
+
+    return request.app.state.geodata_cache
+
+
+def get_result_cache(request: Request) -> GenerationResultCache:
+
+    return request.app.state.result_cache
+
+
+def get_prepared_cache(request: Request) -> GenerationResultCache:
+
+    return request.app.state.prepared_cache
+
+
+def get_job_manager(request: Request) -> JobManager:
+
+    return request.app.state.job_manager
+
+
+def get_profile_storage(request: Request) -> ProfileStorage:
+
+    return request.app.state.profile_storage
@@ -1 +1 @@
-from .openapi_examples import gen_planner_func_zone_dto_example
+from .openapi_examples import gen_planner_batch_dto_example, gen_planner_func_zone_dto_example
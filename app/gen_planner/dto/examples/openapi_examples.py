@@ -1,3 +1,5 @@
+from copy import deepcopy
+
 from .base_open_api_example import base_open_api_example
 
 gen_planner_func_zone_dto_example = base_open_api_example.copy()
@@ -33,3 +35,20 @@ gen_planner_func_zone_dto_example["requestBody"]["content"]["application/json"][
     "functional_zones": {"year": 2025, "source": "User", "fixed_functional_zones_ids": [1619712]},
     "territory_balance": {"6": 0.4, "2": 0.3, "3": 0.1, "7": 0.2},
 }
+
+gen_planner_batch_dto_example = deepcopy(base_open_api_example)
+gen_planner_batch_dto_example["requestBody"]["content"]["application/json"]["example"] = {
+    "functional_zones": {"year": 2025, "source": "User", "fixed_functional_zones_ids": [1619712]},
+    "variants": {
+        "residential": {
+            "min_block_area": {"6": 160000, "2": 130000},
+            "territory_balance": {"6": 0.2, "2": 0.6, "3": 0.1, "7": 0.1},
+        },
+        "business": {
+            "fix_zones": gen_planner_func_zone_dto_example["requestBody"]["content"]["application/json"]["example"][
+                "fix_zones"
+            ],
+            "territory_balance": {"6": 0.4, "2": 0.3, "3": 0.1, "7": 0.2},
+        },
+    },
+}
@@ -0,0 +1,77 @@
+from typing import Optional, Self
+
+from pydantic import BaseModel, Field, model_validator
+
+from app.common.geometries_dto.geometries import FixZoneFeatureCollection
+
+from .gen_planner_func_dto import FuncZonesInfoDTO, GenPlannerFuncZonesDTO
+
+
+class GenPlannerVariantDTO(BaseModel):
+    """
+    DTO for one variant of batch generation.
+    Attributes:
+        fix_zones (Optional[FixZoneFeatureCollection]): The fix zone geometry.
+        min_block_area (Optional[dict[int, float]): Minimum block area for each generating functional zone.
+        territory_balance (dict[int, float]): A dictionary representing the balance of functional zones.
+    """
+
+    fix_zones: Optional[FixZoneFeatureCollection] = Field(
+        default=None, description="Fixed zone geometry with zone attribute"
+    )
+    min_block_area: Optional[dict[int, float]] = Field(default={}, description="Map for each ter zone min block area.")
+    territory_balance: dict[int, float] = Field(
+        description="Balance of functional zones by ID",
+        min_length=1,
+    )
+
+
+class GenPlannerBatchDTO(BaseModel):
+    """
+    DTO for batch generation of several variants on the same project and scenario.
+    Attributes:
+        project_id (int): The project ID.
+        scenario_id (int): The scenario ID.
+        elevation_angle (Optional[int]): The elevation angle in degrees.
+        functional_zones (Optional[FuncZonesInfoDTO]): The functional zones info to make an amendment on.
+        variants (dict[str, GenPlannerVariantDTO]): Variants parameters by variant names.
+
+        _variants_params (dict[str, GenPlannerFuncZonesDTO]): Generation parameters for each variant
+    """
+
+    # service fields
+    _variants_params: dict[str, GenPlannerFuncZonesDTO] = {}
+
+    # request params
+    project_id: int = Field(examples=[120], description="The project ID")
+    scenario_id: int = Field(examples=[835], description="The scenario ID")
+    elevation_angle: Optional[int] = Field(
+        ge=0,
+        le=90,
+        default=None,
+        examples=[5],
+        description=(
+            "The elevation angle in degrees. All polygons with equal or greater angle are excluded from generation."
+        ),
+    )
+    functional_zones: Optional[FuncZonesInfoDTO] = Field(default=None, description="The functional zones info")
+    variants: dict[str, GenPlannerVariantDTO] = Field(
+        min_length=1, max_length=20, description="Variants parameters by variant names"
+    )
+
+    @model_validator(mode="after")
+    def form_variants_params(self) -> Self:
+        """
+        Function forms generation parameters for each variant from shared and variant parameters.
+        """
+
+        shared = self.model_dump(exclude={"variants"})
+        self._variants_params = {
+            name: GenPlannerFuncZonesDTO(
+                **shared,
+                **variant.model_dump(exclude={"fix_zones"}),
+                fix_zones=variant.fix_zones,
+            )
+            for name, variant in self.variants.items()
+        }
+        return self
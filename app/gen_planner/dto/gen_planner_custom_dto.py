@@ -36,3 +36,19 @@ class GenPlannerCustomDTO(BaseModel):
         self._territory_gdf = self.territory.as_gdf(4326)
         self._func_zone = scenario_func_zones_map[self.profile_id]
         return self
+
+    @classmethod
+    def from_territory_gdf(cls, profile_id: int, territory_gdf: gpd.GeoDataFrame) -> Self:
+        """
+        Function forms DTO from already decoded territory, skipping GeoJSON territory validation.
+        Args:
+            profile_id (int): Profile ID to generate functional zones on
+            territory_gdf (gpd.GeoDataFrame): territory to generate functional zones on in EPSG:4326
+        Returns:
+            Self: DTO without territory field, with _territory_gdf and _func_zone set.
+        """
+
+        dto = cls.model_construct(profile_id=profile_id)
+        dto._territory_gdf = territory_gdf
+        dto._func_zone = scenario_func_zones_map[profile_id]
+        return dto
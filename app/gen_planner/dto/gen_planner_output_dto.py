@@ -0,0 +1,45 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class GenPlannerOutputDTO(BaseModel):
+    """
+    DTO for generation result output options. Options are applied to the response only,
+    cached generation results keep full precision.
+    Attributes:
+        precision (Optional[int]): Number of decimal digits kept in output coordinates.
+        simplify_tolerance (Optional[float]): Topology preserving simplification tolerance in meters.
+        min_area (Optional[float]): Minimum area of output polygons in square meters.
+        drop_empty (bool): Whether to drop features with empty or missing geometries.
+    """
+
+    precision: Optional[int] = Field(
+        default=None,
+        ge=0,
+        le=15,
+        examples=[6],
+        description="Number of decimal digits kept in output coordinates. Full precision by default.",
+    )
+    simplify_tolerance: Optional[float] = Field(
+        default=None,
+        ge=0,
+        examples=[1.0],
+        description="Topology preserving simplification tolerance in meters. No simplification by default.",
+    )
+    min_area: Optional[float] = Field(
+        default=None,
+        ge=0,
+        examples=[10.0],
+        description="Polygons with smaller area in square meters are dropped from output.",
+    )
+    drop_empty: bool = Field(default=False, description="Drop features with empty or missing geometries.")
+
+    def is_default(self) -> bool:
+        """
+        Function checks if no output options are requested.
+        Returns:
+            bool: True if output should be left unchanged.
+        """
+
+        return self.precision is None and not self.simplify_tolerance and not self.min_area and not self.drop_empty
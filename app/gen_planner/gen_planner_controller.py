@@ -1,16 +1,33 @@
+import asyncio
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from iduconfig import Config
 
-from app.common.auth.bearer import verify_bearer_token
+from app.common.admission.admission_controller import without_rejection
+from app.common.auth.bearer import get_token_scope, optional_bearer_token, verify_bearer_token
 from app.common.constants.api_constants import scenario_func_zones_map, scenario_ter_zones_map
-from app.dependencies import get_config, get_genplanner_service
+from app.common.exceptions.http_exception import http_exception
+from app.common.jobs.job_manager import JobManager
+from app.common.serialization.binary_reader import TERRITORY_MEDIA_TYPES, read_territory
+from app.common.serialization.compression import ContentEncoding, negotiate_content_encoding
+from app.common.serialization.content_negotiation import (
+    ResultFormat,
+    binary_result_responses,
+    negotiate_result_format,
+)
+from app.dependencies import get_config, get_genplanner_service, get_job_manager
+from app.gen_planner.dto.gen_planner_batch_dto import GenPlannerBatchDTO
 from app.gen_planner.dto.gen_planner_custom_dto import GenPlannerCustomDTO
 from app.gen_planner.dto.gen_planner_func_dto import GenPlannerFuncZonesDTO
-from app.gen_planner.schema.gen_planner_schema import GenPlannerResultSchema
+from app.gen_planner.dto.gen_planner_output_dto import GenPlannerOutputDTO
+from app.gen_planner.schema.gen_planner_schema import (
+    GenPlannerResultSchema,
+    GenPlannerStartSchema,
+    GenPlannerTaskStatusSchema,
+)
 
-from .dto.examples import gen_planner_func_zone_dto_example
+from .dto.examples import gen_planner_batch_dto_example, gen_planner_func_zone_dto_example
 from .gen_planner_service import GenPlannerService
 
 gen_planner_router = APIRouter(tags=["gen_planner"])
@@ -26,21 +43,29 @@ async def get_available_zones_profiles():
 
 
 @gen_planner_router.post(
-    "/run_func_generation", response_model=GenPlannerResultSchema, openapi_extra=gen_planner_func_zone_dto_example
+    "/run_func_generation",
+    response_model=GenPlannerResultSchema,
+    responses=binary_result_responses,
+    openapi_extra=gen_planner_func_zone_dto_example,
 )
 async def run_func_territory_zones_generation(
     params: Annotated[GenPlannerFuncZonesDTO, Depends(GenPlannerFuncZonesDTO)],
     token: str = Depends(verify_bearer_token),
     genplanner_service: GenPlannerService = Depends(get_genplanner_service),
     config: Config = Depends(get_config),
-) -> GenPlannerResultSchema:
+    result_format: ResultFormat = Depends(negotiate_result_format),
+    content_encoding: ContentEncoding = Depends(negotiate_content_encoding),
+    output: GenPlannerOutputDTO = Depends(GenPlannerOutputDTO),
+) -> Response:
 
-    return await genplanner_service.run_func_generation(params, token, config)
+    zones, roads = await genplanner_service.run_func_generation(params, token, config)
+    return await genplanner_service.form_genplanner_response(zones, roads, result_format, content_encoding, output)
 
 
 @gen_planner_router.post(
     "/run_func_generation/only_zones",
     response_model=GenPlannerResultSchema,
+    responses=binary_result_responses,
     openapi_extra=gen_planner_func_zone_dto_example,
 )
 async def run_only_zones_generation(
@@ -48,18 +73,83 @@ async def run_only_zones_generation(
     token: str = Depends(verify_bearer_token),
     gen_planner_service: GenPlannerService = Depends(get_genplanner_service),
     config: Config = Depends(get_config),
-):
+    result_format: ResultFormat = Depends(negotiate_result_format),
+    content_encoding: ContentEncoding = Depends(negotiate_content_encoding),
+    output: GenPlannerOutputDTO = Depends(GenPlannerOutputDTO),
+) -> Response:
+
+    zones, roads = await gen_planner_service.run_func_generation(params, token, config, True)
+    return await gen_planner_service.form_genplanner_response(zones, roads, result_format, content_encoding, output)
+
+
+@gen_planner_router.post(
+    "/batch/run_func_generation",
+    response_model=dict[str, GenPlannerResultSchema],
+    openapi_extra=gen_planner_batch_dto_example,
+)
+async def run_batch_func_territory_zones_generation(
+    params: Annotated[GenPlannerBatchDTO, Depends(GenPlannerBatchDTO)],
+    only_zones: bool = False,
+    token: str = Depends(verify_bearer_token),
+    genplanner_service: GenPlannerService = Depends(get_genplanner_service),
+    config: Config = Depends(get_config),
+    content_encoding: ContentEncoding = Depends(negotiate_content_encoding),
+    output: GenPlannerOutputDTO = Depends(GenPlannerOutputDTO),
+) -> Response:
+    """
+    Run functional generation for several variants of the same project and scenario,
+    inputs are extracted once and results are returned by variant names
+    """
 
-    return await gen_planner_service.run_func_generation(params, token, config, True)
+    results = await genplanner_service.run_batch_func_generation(params, token, config, only_zones)
+    return await genplanner_service.form_genplanner_batch_response(results, content_encoding, output)
 
 
-@gen_planner_router.post("/custom/run_func_generation", response_model=GenPlannerResultSchema)
+@gen_planner_router.post(
+    "/custom/run_func_generation", response_model=GenPlannerResultSchema, responses=binary_result_responses
+)
 async def run_custom_territory_zones_generation(
     params: Annotated[GenPlannerCustomDTO, Depends(GenPlannerCustomDTO)],
     genplanner_service: GenPlannerService = Depends(get_genplanner_service),
-) -> GenPlannerResultSchema:
+    result_format: ResultFormat = Depends(negotiate_result_format),
+    content_encoding: ContentEncoding = Depends(negotiate_content_encoding),
+    output: GenPlannerOutputDTO = Depends(GenPlannerOutputDTO),
+) -> Response:
 
-    return await genplanner_service.run_custom_func_generation(params)
+    zones, roads = await genplanner_service.run_custom_func_generation(params)
+    return await genplanner_service.form_genplanner_response(zones, roads, result_format, content_encoding, output)
+
+
+@gen_planner_router.post(
+    "/custom/run_func_generation/binary",
+    response_model=GenPlannerResultSchema,
+    responses=binary_result_responses,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                media_type: {"schema": {"type": "string", "format": "binary"}} for media_type in TERRITORY_MEDIA_TYPES
+            },
+        }
+    },
+)
+async def run_custom_binary_territory_zones_generation(
+    request: Request,
+    profile_id: int = Query(ge=1, le=13, examples=[1], description="Profile ID to generate functional zones"),
+    genplanner_service: GenPlannerService = Depends(get_genplanner_service),
+    result_format: ResultFormat = Depends(negotiate_result_format),
+    content_encoding: ContentEncoding = Depends(negotiate_content_encoding),
+    output: GenPlannerOutputDTO = Depends(GenPlannerOutputDTO),
+) -> Response:
+    """
+    Run custom generation on territory sent as request body in WKB, GeoParquet or FlatGeobuf,
+    format is selected by Content-Type header
+    """
+
+    territory_gdf = await asyncio.to_thread(read_territory, await request.body(), request.headers.get("content-type"))
+    params = GenPlannerCustomDTO.from_territory_gdf(profile_id, territory_gdf)
+    zones, roads = await genplanner_service.run_custom_func_generation(params)
+    return await genplanner_service.form_genplanner_response(zones, roads, result_format, content_encoding, output)
 
 
 @gen_planner_router.get("/default/func_ratio", response_model=dict[int, float])
@@ -69,3 +159,95 @@ async def get_func_zone_ratio(
 ) -> dict[int, float]:
 
     return await genplanner_service.get_func_zone_ratio(zone)
+
+
+@gen_planner_router.post(
+    "/tasks/run_func_generation",
+    response_model=GenPlannerStartSchema,
+    status_code=202,
+    openapi_extra=gen_planner_func_zone_dto_example,
+)
+async def submit_func_territory_zones_generation(
+    params: Annotated[GenPlannerFuncZonesDTO, Depends(GenPlannerFuncZonesDTO)],
+    only_zones: bool = False,
+    token: str = Depends(verify_bearer_token),
+    genplanner_service: GenPlannerService = Depends(get_genplanner_service),
+    config: Config = Depends(get_config),
+    job_manager: JobManager = Depends(get_job_manager),
+) -> GenPlannerStartSchema:
+    """
+    Submit functional generation task, poll /tasks/{task_id} for its status and /tasks/{task_id}/result for result.
+    Task is available only with the same bearer token it was submitted with.
+    """
+
+    job = job_manager.submit(
+        get_token_scope(token),
+        lambda: without_rejection(genplanner_service.run_func_generation(params, token, config, only_zones)),
+    )
+    return GenPlannerStartSchema(task_id=job.task_id)
+
+
+@gen_planner_router.post("/tasks/custom/run_func_generation", response_model=GenPlannerStartSchema, status_code=202)
+async def submit_custom_territory_zones_generation(
+    params: Annotated[GenPlannerCustomDTO, Depends(GenPlannerCustomDTO)],
+    token: str | None = Depends(optional_bearer_token),
+    genplanner_service: GenPlannerService = Depends(get_genplanner_service),
+    job_manager: JobManager = Depends(get_job_manager),
+) -> GenPlannerStartSchema:
+    """
+    Submit custom functional generation task,
+    poll /tasks/{task_id} for its status and /tasks/{task_id}/result for result
+    """
+
+    job = job_manager.submit(
+        get_token_scope(token), lambda: without_rejection(genplanner_service.run_custom_func_generation(params))
+    )
+    return GenPlannerStartSchema(task_id=job.task_id)
+
+
+@gen_planner_router.get("/tasks/{task_id}", response_model=GenPlannerTaskStatusSchema)
+async def get_generation_task_status(
+    task_id: str,
+    token: str | None = Depends(optional_bearer_token),
+    job_manager: JobManager = Depends(get_job_manager),
+) -> GenPlannerTaskStatusSchema:
+
+    return GenPlannerTaskStatusSchema(**job_manager.get(task_id, get_token_scope(token)).as_dict())
+
+
+@gen_planner_router.get(
+    "/tasks/{task_id}/result", response_model=GenPlannerResultSchema, responses=binary_result_responses
+)
+async def get_generation_task_result(
+    task_id: str,
+    token: str | None = Depends(optional_bearer_token),
+    genplanner_service: GenPlannerService = Depends(get_genplanner_service),
+    job_manager: JobManager = Depends(get_job_manager),
+    result_format: ResultFormat = Depends(negotiate_result_format),
+    content_encoding: ContentEncoding = Depends(negotiate_content_encoding),
+    output: GenPlannerOutputDTO = Depends(GenPlannerOutputDTO),
+) -> Response:
+    """
+    Get generation task result. Failed task raises its original error,
+    cancelled task responds with 410, unfinished task with 409
+    """
+
+    job = job_manager.get(task_id, get_token_scope(token))
+    if job.status == "finished":
+        zones, roads = job.result
+        return await genplanner_service.form_genplanner_response(zones, roads, result_format, content_encoding, output)
+    if job.status == "failed":
+        raise HTTPException(status_code=job.error["status_code"], detail=job.error["detail"])
+    if job.status == "cancelled":
+        raise http_exception(410, "Task was cancelled", _input={"task_id": task_id}, _detail={"status": job.status})
+    raise http_exception(409, "Task is not finished", _input={"task_id": task_id}, _detail={"status": job.status})
+
+
+@gen_planner_router.delete("/tasks/{task_id}", response_model=GenPlannerTaskStatusSchema)
+async def cancel_generation_task(
+    task_id: str,
+    token: str | None = Depends(optional_bearer_token),
+    job_manager: JobManager = Depends(get_job_manager),
+) -> GenPlannerTaskStatusSchema:
+
+    return GenPlannerTaskStatusSchema(**job_manager.cancel(task_id, get_token_scope(token)).as_dict())
@@ -1,24 +1,52 @@
 import asyncio
-import json
-from typing import Literal
+import pickle
+import time
+from contextlib import nullcontext
+from functools import partial
+from importlib.metadata import version
+from typing import Any, AsyncIterator, Iterator, Literal
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
+import shapely
+from fastapi import Response
+from fastapi.responses import StreamingResponse
 from genplanner import GenPlanner
 from iduconfig import Config
 from loguru import logger
-from shapely import buffer
 
 from app.clients.ecodonat_api_client import EcodonutApiClient
 from app.clients.urban_api_client import UrbanApiClient
+from app.common.admission.admission_controller import AdmissionController
+from app.common.caching.fingerprint import fingerprint_gdf, fingerprint_inputs, fingerprint_params
+from app.common.caching.geodata_cache import MISSING, copy_value
+from app.common.caching.result_cache import GenerationResultCache
 from app.common.constants.api_constants import scenario_func_zones_map, scenario_ter_zones_map
+from app.common.metrics.metrics import observe_stage, timed_stage
+from app.common.orchestration.task_graph import TaskGraph
+from app.common.serialization.binary_writer import encode_layers
+from app.common.serialization.compression import ContentEncoding, iter_compressed
+from app.common.serialization.content_negotiation import (
+    RESULT_FILE_EXTENSIONS,
+    RESULT_MEDIA_TYPES,
+    ResultFormat,
+)
+from app.common.serialization.geojson_writer import iter_feature_collections, iter_grouped_feature_collections
+from app.common.serialization.output_options import apply_output_options
+from app.common.tracing.tracer import start_span, trace_span
 
+from .dto.gen_planner_batch_dto import GenPlannerBatchDTO
 from .dto.gen_planner_custom_dto import GenPlannerCustomDTO
 from .dto.gen_planner_func_dto import GenPlannerFuncZonesDTO
-from .schema.gen_planner_schema import GenPlannerResultSchema
+from .dto.gen_planner_output_dto import GenPlannerOutputDTO
+from .generation_executor import GenerationExecutor
 
 ROADS_OBJECTS_IDS = [50, 51, 52]
 WATER_OBJECTS_IDS = [2, 44, 45, 54, 55]
+LINE_TYPE_IDS = [1, 5]
+CONTEXT_MARGIN_METERS = 50
+GENPLANNER_VERSION = version("genplanner")
 
 
 class GenPlannerService:
@@ -30,122 +58,199 @@ class GenPlannerService:
     Attributes:
         urban_api_client (UrbanApiClient): Client for accessing urban API services.
         ecodonut_api (EcodonutApiClient): An instance of EcodonutApiClient to interact with urban API services.
+        result_cache (GenerationResultCache | None): Cache for generation results.
+        executor (GenerationExecutor): Executor running GenPlanner in threads or worker processes.
+        prepared_cache (GenerationResultCache | None): Cache for pickled GenPlanner objects with preprocessed territory.
     """
 
-    def __init__(self, urban_api: UrbanApiClient, ecodonut_api: EcodonutApiClient):
+    def __init__(
+        self,
+        urban_api: UrbanApiClient,
+        ecodonut_api: EcodonutApiClient,
+        result_cache: GenerationResultCache | None = None,
+        executor: GenerationExecutor | None = None,
+        prepared_cache: GenerationResultCache | None = None,
+        admission_controller: AdmissionController | None = None,
+    ):
         """
         Initializes the GenPlannerService with the provided UrbanApiClient instance.
         Args:
             urban_api (UrbanApiClient): An instance of UrbanApiClient to interact with urban API services.
             ecodonut_api (EcodonutApiClient): An instance of EcodonutApiClient to interact with urban API services.
+            result_cache (GenerationResultCache | None): Cache for generation results. Defaults to None.
+            executor (GenerationExecutor | None): Executor for generation jobs. Defaults to thread executor.
+            prepared_cache (GenerationResultCache | None): Cache for prepared GenPlanner objects. Defaults to None.
+            admission_controller (AdmissionController | None): Limiter of simultaneous generations.
+            Defaults to None, admitting all generations.
         """
 
         self.urban_api_client: UrbanApiClient = urban_api
         self.ecodonut_api_client: EcodonutApiClient = ecodonut_api
+        self.result_cache: GenerationResultCache | None = result_cache
+        self.executor: GenerationExecutor = executor if executor else GenerationExecutor("thread")
+        self.prepared_cache: GenerationResultCache | None = prepared_cache
+        self._preparing: dict[str, asyncio.Task] = {}
+        self._generating: dict[str, asyncio.Task] = {}
+        self._waiters: dict[asyncio.Task, int] = {}
+        self._executing: set[asyncio.Task] = set()
+        self.admission_controller: AdmissionController | None = admission_controller
+
+    @property
+    def generations_in_flight(self) -> int:
+        return len(self._generating)
+
+    @staticmethod
+    def clip_to_territory(
+        gdf: gpd.GeoDataFrame, territory: gpd.GeoDataFrame | None, margin: float = CONTEXT_MARGIN_METERS
+    ) -> gpd.GeoDataFrame:
+        """
+        Function keeps only features intersecting the territory extended with margin, using STRtree query.
+        Args:
+            gdf (gpd.GeoDataFrame): Features to filter.
+            territory (gpd.GeoDataFrame | None): Territory to filter features by.
+            margin (float): Margin around territory in meters. Defaults to CONTEXT_MARGIN_METERS.
+        Returns:
+            gpd.GeoDataFrame: Features near territory in the original order.
+        """
+
+        if gdf.empty or territory is None or territory.empty:
+            return gdf
+        local_crs = territory.estimate_utm_crs()
+        area = gpd.GeoSeries([territory.to_crs(local_crs).union_all().buffer(margin)], crs=local_crs).to_crs(gdf.crs)
+        index = shapely.STRtree(gdf.geometry.values).query(area.iloc[0], predicate="intersects")
+        return gdf.iloc[np.sort(index)]
 
-    async def form_exclude_to_cut(
-        self, scenario_id: int, project_id: int, angle: int | None, token: str
+    @staticmethod
+    def form_exclude_to_cut(
+        water: gpd.GeoDataFrame | None,
+        context_water: gpd.GeoDataFrame | None,
+        slope_polygons: gpd.GeoDataFrame,
+        territory: gpd.GeoDataFrame | None = None,
     ) -> dict[Literal["exclude_features"], gpd.GeoDataFrame]:
         """
-        Function retrieves water objects to cut from scenario and context.
+        Function forms features to cut from scenario water, context water and slope polygons.
+        Context water is clipped to the territory surroundings before water lines are buffered.
         Args:
-            scenario_id (int): ID of the scenario.
-            project_id (int): ID of the project.
-            angle (int): The relief angle.
-            token (str): User bearer access token.
+            water (gpd.GeoDataFrame | None): Water objects from scenario.
+            context_water (gpd.GeoDataFrame | None): Water objects from scenario context.
+            slope_polygons (gpd.GeoDataFrame): Slope polygons with relief angle greater than requested.
+            territory (gpd.GeoDataFrame | None): Territory to generate zones on. Defaults to None, disabling clipping.
         Returns:
             dict[Literal["exclude_features"], gpd.GeoDataFrame]: Water objects to cut as dict with gdf.
         """
 
-        water, context_water, slope_polygons = await asyncio.gather(
-            self.urban_api_client.get_physical_objects_for_scenario(scenario_id, WATER_OBJECTS_IDS, token),
-            self.urban_api_client.get_physical_objects_for_context(scenario_id, WATER_OBJECTS_IDS, token),
-            self.ecodonut_api_client.get_slope_polygons(token, project_id, angle),
-        )
         if not context_water is None:
             context_water = context_water[
                 context_water.geometry.geom_type.isin(["MultiPolygon", "Polygon", "MultiLineString", "LineString"])
             ]
-            context_water.to_crs(context_water.estimate_utm_crs(), inplace=True)
-            context_water.geometry = context_water.geometry.apply(
-                lambda x: buffer(x, 2.5) if x.geom_type in ["MultiLineString", "LineString"] else x
-            )
-            context_water.to_crs(4326, inplace=True)
+            context_water = GenPlannerService.clip_to_territory(context_water, territory)
+            if not context_water.empty:
+                context_water = context_water.to_crs(context_water.estimate_utm_crs())
+                geometries = context_water.geometry.values.copy()
+                lines = np.isin(shapely.get_type_id(geometries), LINE_TYPE_IDS)
+                geometries[lines] = shapely.buffer(geometries[lines], 2.5)
+                context_water = context_water.set_geometry(geometries).to_crs(4326)
             water = pd.concat([water, context_water])
         return {"exclude_features": pd.concat([water, slope_polygons])}
 
-    async def form_roads(self, scenario_id: int, token: str) -> dict[Literal["roads"], gpd.GeoDataFrame]:
-        """
-        Function retrieves roads objects from scenario.
-        Args:
-            scenario_id (int): ID of the scenario.
-            token (str): User bearer access token.
-        Returns:
-            dict[Literal["roads"], gpd.GeoDataFrame]: Roads objects as dict with gdf.
-        """
-
-        roads = await self.urban_api_client.get_physical_objects_for_scenario(scenario_id, ROADS_OBJECTS_IDS, token)
-        return {"roads": roads}
-
     async def get_all_physical_objects(
         self, project_id: int, scenario_id: int, angle: int | None, token: str
-    ) -> dict[Literal["exclude_features", "roads"], gpd.GeoDataFrame]:
+    ) -> dict[Literal["water", "context_water", "slope_polygons", "roads"], gpd.GeoDataFrame | None]:
         """
         Function retrieves all physical objects for the given project and scenario.
+        Water and roads are requested together for scenario and split locally.
         Args:
             project_id (int): ID of the project.
             scenario_id (int): ID of the scenario.
             angle (int)
             token (str): User bearer access token.
         Returns:
-            dict[Literal["exclude_features", "roads"], gpd.GeoDataFrame]: Dictionary containing water and roads GeoDataFrames.
+            dict[Literal["water", "context_water", "slope_polygons", "roads"], gpd.GeoDataFrame | None]:
+            Dictionary containing scenario water, context water, slope polygons and roads GeoDataFrames.
         """
 
-        objects = await asyncio.gather(
-            *[self.form_exclude_to_cut(scenario_id, project_id, angle, token), self.form_roads(scenario_id, token)]
+        scenario_objects, context_objects, slope_polygons = await asyncio.gather(
+            self.urban_api_client.get_physical_objects_for_scenario(
+                scenario_id, {"water": WATER_OBJECTS_IDS, "roads": ROADS_OBJECTS_IDS}, token
+            ),
+            self.urban_api_client.get_physical_objects_for_context(scenario_id, {"water": WATER_OBJECTS_IDS}, token),
+            self.ecodonut_api_client.get_slope_polygons(token, project_id, angle),
         )
-        return {k: v for d in objects for k, v in d.items()}
+        return {
+            "water": scenario_objects["water"],
+            "context_water": context_objects["water"],
+            "slope_polygons": slope_polygons,
+            "roads": scenario_objects["roads"],
+        }
 
-    async def restore_params(self, params: GenPlannerFuncZonesDTO, token: str) -> GenPlannerFuncZonesDTO:
+    @staticmethod
+    def prepare_functional_zones(func_zones: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
         """
-        Function restores parameters for the generation.
+        Function adds functional zone type ids and territory zones to functional zones from urban api.
         Args:
-            params (GenPlannerFuncZonesDTO): Parameters for the generation.
-            token (str): User bearer access token.
+            func_zones (gpd.GeoDataFrame): Functional zones from urban api.
         Returns:
-            GenPlannerFuncZonesDTO: Restored parameters for the generation.
+            gpd.GeoDataFrame: Functional zones with functional_zone_type_id and territory_zone columns.
         """
 
-        params._territory_gdf = await self.urban_api_client.get_territory_geom_by_project_id(params.project_id, token)
-        return params
+        func_zones["functional_zone_type_id"] = func_zones["functional_zone_type"].map(lambda x: x["id"])
+        func_zones["territory_zone"] = func_zones["functional_zone_type_id"].map(scenario_ter_zones_map)
+        return func_zones
 
-    async def form_genplanner(
+    async def form_genplanner_params(
         self, params: GenPlannerFuncZonesDTO, token: str, config: Config, only_on_zones: bool = False
-    ) -> GenPlanner:
+    ) -> dict[str, Any]:
         """
-        Function forms GenPlanner object with the given parameters.
+        Function forms GenPlanner initialization parameters with the given request parameters.
+        Territory, physical objects and functional zones are requested concurrently as a task graph,
+        exclusions are formed as soon as objects and the final territory are available.
         Args:
             params (GenPlannerFuncZonesDTO): Parameters for the generation.
             token (str): User bearer access token.
             only_on_zones (bool): Weather to generate only using requested zones.
         Returns:
-            GenPlanner: GenPlanner object with the given parameters.
+            dict[str, Any]: GenPlanner initialization parameters.
         """
 
-        params = await self.restore_params(params, token)
-        objects = await self.get_all_physical_objects(
-            params.project_id, params.scenario_id, params.elevation_angle, token
+        graph = TaskGraph(f"inputs for project {params.project_id} scenario {params.scenario_id}")
+        graph.add(
+            "territory", partial(self.urban_api_client.get_territory_geom_by_project_id, params.project_id, token)
+        )
+        graph.add(
+            "physical_objects",
+            partial(
+                self.get_all_physical_objects, params.project_id, params.scenario_id, params.elevation_angle, token
+            ),
         )
         # TODO revise if-else logic
         if params.functional_zones:
-            func_zones = await self.urban_api_client.get_functional_zones(
-                token,
-                params.scenario_id,
-                year=params.functional_zones.year,
-                source=params.functional_zones.source,
+            graph.add(
+                "functional_zones_response",
+                partial(
+                    self.urban_api_client.get_functional_zones,
+                    token,
+                    params.scenario_id,
+                    year=params.functional_zones.year,
+                    source=params.functional_zones.source,
+                ),
             )
-            func_zones["functional_zone_type_id"] = func_zones["functional_zone_type"].map(lambda x: x["id"])
-            func_zones["territory_zone"] = func_zones["functional_zone_type_id"].map(scenario_ter_zones_map)
+            graph.add("functional_zones", self.prepare_functional_zones, ["functional_zones_response"])
+        territory_step = "functional_zones" if params.functional_zones and only_on_zones else "territory"
+        graph.add(
+            "form_exclude_to_cut",
+            lambda objects, territory: self.form_exclude_to_cut(
+                objects["water"], objects["context_water"], objects["slope_polygons"], territory
+            ),
+            ["physical_objects", territory_step],
+            in_thread=True,
+        )
+        with trace_span("inputs", project_id=params.project_id, scenario_id=params.scenario_id):
+            inputs = await graph.run()
+        for step, duration in graph.timings.items():
+            observe_stage(f"inputs_{step}", duration)
+        params._territory_gdf = inputs["territory"]
+        if params.functional_zones:
+            func_zones = inputs["functional_zones"]
             if only_on_zones:
                 params._initial_zones_to_add = func_zones[
                     ~func_zones["functional_zone_id"].isin(params.functional_zones.fixed_functional_zones_ids)
@@ -160,52 +265,446 @@ class GenPlannerService:
         if isinstance(func_zones, gpd.GeoDataFrame):
             logger.info(f"func_zones ids: {func_zones['functional_zone_id']}")
             logger.info(f"Only on zones: {only_on_zones}")
-        return GenPlanner(
-            params._territory_gdf,
-            **objects,
-            existing_terr_zones=None if only_on_zones else func_zones,
-            simplify_value=10,
-            parallel=False if config.get("APP_ENV") == "development" else True,
-        )
+        return {
+            "features": params._territory_gdf,
+            "roads": inputs["physical_objects"]["roads"],
+            **inputs["form_exclude_to_cut"],
+            "existing_terr_zones": None if only_on_zones else func_zones,
+            "simplify_value": 10,
+            "parallel": False if config.get("APP_ENV") == "development" else True,
+        }
 
     @staticmethod
-    async def form_custom_genplanner(params: GenPlannerCustomDTO) -> GenPlanner:
+    async def form_custom_genplanner_params(params: GenPlannerCustomDTO) -> dict[str, Any]:
         """
-        Function forms GenPlanner object with the given parameters.
+        Function forms GenPlanner initialization parameters with the given request parameters.
         Args:
             params (GenPlannerCustomDTO): Parameters for the generation.
         Returns:
-            GenPlanner: GenPlanner object with the given parameters.
+            dict[str, Any]: GenPlanner initialization parameters.
+        """
+
+        return {"features": params._territory_gdf, "simplify_value": 10}
+
+    @staticmethod
+    def fingerprint_genplanner_params(genplanner_params: dict[str, Any]) -> list[str]:
+        """
+        Function forms fingerprints of GenPlanner initialization parameters.
+        Args:
+            genplanner_params (dict[str, Any]): GenPlanner initialization parameters with upstream inputs.
+        Returns:
+            list[str]: Fingerprints of parameters sorted by names.
+        """
+
+        return [
+            fingerprint_gdf(value) if isinstance(value, pd.DataFrame) or value is None else str(value)
+            for _, value in sorted(genplanner_params.items())
+        ]
+
+    @staticmethod
+    def form_result_cache_key(request_fingerprint: str, params_fingerprints: list[str], *extra: Any) -> str:
+        """
+        Function forms generation result cache key from request and upstream inputs fingerprints.
+        Args:
+            request_fingerprint (str): Canonical hash of request parameters.
+            params_fingerprints (list[str]): Fingerprints of GenPlanner initialization parameters.
+            *extra (Any): Additional values affecting generation result.
+        Returns:
+            str: Result cache key.
+        """
+
+        return fingerprint_inputs(GENPLANNER_VERSION, request_fingerprint, *params_fingerprints, *map(str, extra))
+
+    @staticmethod
+    def form_prepared_cache_key(params_fingerprints: list[str], *scope: Any) -> str:
+        """
+        Function forms prepared GenPlanner cache key from upstream inputs fingerprints and request scope.
+        Args:
+            params_fingerprints (list[str]): Fingerprints of GenPlanner initialization parameters.
+            *scope (Any): Request values defining GenPlanner inputs, e.g. project, scenario and elevation angle.
+        Returns:
+            str: Prepared GenPlanner cache key.
+        """
+
+        return fingerprint_inputs(GENPLANNER_VERSION, "prepared", *map(str, scope), *params_fingerprints)
+
+    @staticmethod
+    def prepare_genplanner(genplanner_params: dict[str, Any]) -> bytes:
+        """
+        Function forms GenPlanner object, preprocessing territory, and pickles it for reuse.
+        Args:
+            genplanner_params (dict[str, Any]): GenPlanner initialization parameters.
+        Returns:
+            bytes: Pickled GenPlanner object.
         Raises:
             Any from GenPlanner initialization
         """
 
-        return GenPlanner(params._territory_gdf, simplify_value=10)
+        with timed_stage("genplanner_init"):
+            genplanner = GenPlanner(**genplanner_params)
+        return pickle.dumps(genplanner, protocol=pickle.HIGHEST_PROTOCOL)
 
     @staticmethod
-    async def form_genplanner_response(
+    def generate_zones(
+        genplanner_params: dict[str, Any], generation_params: dict[str, Any]
+    ) -> tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]:
+        """
+        Function forms GenPlanner object and generates territory zones with blocks.
+        Args:
+            genplanner_params (dict[str, Any]): GenPlanner initialization parameters.
+            generation_params (dict[str, Any]): GenPlanner.features2terr_zones2blocks parameters.
+        Returns:
+            tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]: Generated zones and roads.
+        Raises:
+            Any from GenPlanner initialization and generation
+        """
+
+        with timed_stage("genplanner_init"):
+            genplanner = GenPlanner(**genplanner_params)
+        with timed_stage("features2terr_zones2blocks"):
+            return genplanner.features2terr_zones2blocks(**generation_params)
+
+    @staticmethod
+    def generate_prepared_zones(
+        prepared_genplanner: bytes, generation_params: dict[str, Any]
+    ) -> tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]:
+        """
+        Function restores prepared GenPlanner object and generates territory zones with blocks.
+        Args:
+            prepared_genplanner (bytes): Pickled GenPlanner object.
+            generation_params (dict[str, Any]): GenPlanner.features2terr_zones2blocks parameters.
+        Returns:
+            tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]: Generated zones and roads.
+        Raises:
+            Any from GenPlanner generation
+        """
+
+        with timed_stage("genplanner_restore"):
+            genplanner = pickle.loads(prepared_genplanner)
+        with timed_stage("features2terr_zones2blocks"):
+            return genplanner.features2terr_zones2blocks(**generation_params)
+
+    async def _prepare_and_cache(self, prepared_key: str, genplanner_params: dict[str, Any]) -> bytes:
+
+        prepared = await self.executor.run(self.prepare_genplanner, genplanner_params)
+        await self.prepared_cache.set(prepared_key, prepared)
+        return prepared
+
+    async def get_prepared_genplanner(self, prepared_key: str, genplanner_params: dict[str, Any]) -> bytes | None:
+        """
+        Function returns cached prepared GenPlanner or prepares it in executor and caches it.
+        Concurrent calls with the same key wait for one preparation.
+        Args:
+            prepared_key (str): Prepared GenPlanner cache key.
+            genplanner_params (dict[str, Any]): GenPlanner initialization parameters.
+        Returns:
+            bytes | None: Pickled GenPlanner object, None if prepared cache is disabled.
+        """
+
+        if not self.prepared_cache:
+            return None
+        prepared = await self.prepared_cache.get(prepared_key)
+        if prepared is not MISSING:
+            logger.info(f"Prepared GenPlanner {prepared_key} is taken from cache")
+            return prepared
+        task = self._preparing.get(prepared_key)
+        if task is None:
+            task = asyncio.create_task(self._prepare_and_cache(prepared_key, genplanner_params))
+            self._preparing[prepared_key] = task
+            task.add_done_callback(lambda _: self._preparing.pop(prepared_key, None))
+        return await asyncio.shield(task)
+
+    @staticmethod
+    def form_genplanner_result(
         zones: gpd.GeoDataFrame, roads: gpd.GeoDataFrame
-    ) -> dict[Literal["zones", "roads"], dict]:
+    ) -> tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]:
         """
-        Function forms GenPlannerResultSchema from the given roads and zones GeoDataFrames.
+        Function prepares generated zones for response, replacing territory zones objects with their names.
         Args:
-            roads (gpd.GeoDataFrame): Roads GeoDataFrame.
             zones (gpd.GeoDataFrame): Zones GeoDataFrame.
+            roads (gpd.GeoDataFrame): Roads GeoDataFrame.
         Returns:
-            GenPlannerResultSchema: GenPlanner result schema with the given roads and zones.
+            tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]: Prepared zones and roads.
         """
 
         if "territory_zone" in zones.columns:
             zones["territory_zone"] = zones["territory_zone"].apply(lambda x: x.name if x and not pd.isna(x) else None)
         zones.drop(columns="func_zone", inplace=True)
-        return {"zones": json.loads(zones.to_json()), "roads": json.loads(roads.to_json())}
+        return zones, roads
 
     @staticmethod
-    async def log_request_params(params: GenPlannerFuncZonesDTO, start: bool) -> None:
+    def estimate_generation_size(
+        genplanner_params: dict[str, Any], generation_params: dict[str, Any]
+    ) -> tuple[float, int]:
+        """
+        Function estimates generation size for admission cost.
+        Args:
+            genplanner_params (dict[str, Any]): GenPlanner initialization parameters.
+            generation_params (dict[str, Any]): GenPlanner.features2terr_zones2blocks parameters.
+        Returns:
+            tuple[float, int]: Territory area in km2 and number of fixed and existing zones.
+        """
+
+        territory = genplanner_params["features"]
+        area_km2 = territory.to_crs(territory.estimate_utm_crs()).area.sum() / 1e6 if not territory.empty else 0
+        zones_count = sum(
+            len(zones)
+            for zones in (genplanner_params.get("existing_terr_zones"), generation_params.get("fixed_terr_zones"))
+            if zones is not None
+        )
+        return area_km2, zones_count
+
+    async def _generate_and_cache(
+        self,
+        cache_key: str,
+        genplanner_params: dict[str, Any],
+        generation_params: dict[str, Any],
+        zones_to_add: gpd.GeoDataFrame | None,
+        prepared_key: str | None,
+    ) -> tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]:
+
+        if self.admission_controller:
+            size = await asyncio.to_thread(self.estimate_generation_size, genplanner_params, generation_params)
+            admission = self.admission_controller.admit(self.admission_controller.estimate_cost(*size))
+        else:
+            admission = nullcontext()
+        with trace_span("generation", cache_key=cache_key):
+            async with admission:
+                task = asyncio.current_task()
+                self._executing.add(task)
+                work = asyncio.ensure_future(self._run_generation(genplanner_params, generation_params, prepared_key))
+                try:
+                    zones, roads = await asyncio.shield(work)
+                except asyncio.CancelledError:
+                    # executor work can't be interrupted, so admission capacity is held until it finishes
+                    await asyncio.wait([work])
+                    raise
+                finally:
+                    self._executing.discard(task)
+        if zones_to_add is not None:
+            zones = pd.concat([zones, zones_to_add])
+        zones, roads = self.form_genplanner_result(zones, roads)
+        if self.result_cache:
+            await self.result_cache.set(cache_key, (zones, roads))
+        return zones, roads
+
+    async def _run_generation(
+        self, genplanner_params: dict[str, Any], generation_params: dict[str, Any], prepared_key: str | None
+    ) -> tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]:
+
+        prepared = await self.get_prepared_genplanner(prepared_key, genplanner_params) if prepared_key else None
+        if prepared is not None:
+            return await self.executor.run(self.generate_prepared_zones, prepared, generation_params)
+        return await self.executor.run(self.generate_zones, genplanner_params, generation_params)
+
+    def _forget_generation(self, cache_key: str, task: asyncio.Task) -> None:
+
+        if self._generating.get(cache_key) is task:
+            del self._generating[cache_key]
+        if not task.cancelled():
+            task.exception()
+
+    async def generate(
+        self,
+        cache_key: str,
+        genplanner_params: dict[str, Any],
+        generation_params: dict[str, Any],
+        zones_to_add: gpd.GeoDataFrame | None = None,
+        prepared_key: str | None = None,
+    ) -> tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]:
+        """
+        Function returns cached generation result or runs generation in executor and caches its result.
+        Concurrent calls with the same cache key attach to one running generation and receive copies of its result.
+        Generation waiting for admission is cancelled when all its callers are cancelled or disconnected.
+        Generation already running in executor can't be interrupted, so it is finished and cached without callers
+        and repeated calls attach to it.
+        If prepared key is given, GenPlanner with preprocessed territory is reused between generations.
+        Args:
+            cache_key (str): Result cache key.
+            genplanner_params (dict[str, Any]): GenPlanner initialization parameters.
+            generation_params (dict[str, Any]): GenPlanner.features2terr_zones2blocks parameters.
+            zones_to_add (gpd.GeoDataFrame | None): Zones to add to generated zones. Defaults to None.
+            prepared_key (str | None): Prepared GenPlanner cache key. Defaults to None.
+        Returns:
+            tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]: Prepared zones and roads.
+        """
+
+        if self.result_cache:
+            cached = await self.result_cache.get(cache_key)
+            if cached is not MISSING:
+                logger.info(f"Generation result {cache_key} is taken from cache")
+                return cached
+        task = self._generating.get(cache_key)
+        attached = task is not None and not task.cancelling()
+        if attached:
+            logger.info(f"Generation {cache_key} is already running, waiting for its result")
+        else:
+            task = asyncio.create_task(
+                self._generate_and_cache(cache_key, genplanner_params, generation_params, zones_to_add, prepared_key)
+            )
+            self._generating[cache_key] = task
+            task.add_done_callback(lambda finished: self._forget_generation(cache_key, finished))
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            result = await asyncio.shield(task)
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                if not task.done() and task not in self._executing:
+                    logger.info(f"Generation {cache_key} has no waiting callers, cancelling it")
+                    task.cancel()
+                elif not task.done():
+                    logger.info(f"Generation {cache_key} has no waiting callers, finishing it in background")
+        return copy_value(result) if attached else result
+
+    @staticmethod
+    async def iter_in_thread(chunks: Iterator[bytes], stage: str = "serialization") -> AsyncIterator[bytes]:
+        """
+        Function iterates blocking chunks iterator in thread, one chunk at a time.
+        Time spent on forming chunks is recorded as stage duration.
+        Args:
+            chunks (Iterator[bytes]): Chunks iterator.
+            stage (str): Stage name to record. Defaults to "serialization".
+        Yields:
+            bytes: Chunks.
+        """
+
+        span = start_span(stage)
+        duration, size = 0.0, 0
+        try:
+            while True:
+                started_at = time.perf_counter()
+                chunk = await asyncio.to_thread(next, chunks, None)
+                duration += time.perf_counter() - started_at
+                if chunk is None:
+                    return
+                size += len(chunk)
+                yield chunk
+        finally:
+            observe_stage(stage, duration)
+            if span is not None:
+                span.set_attributes(busy_seconds=duration, bytes=size)
+                span.end()
+
+    @staticmethod
+    def apply_groups_output_options(
+        groups: dict[str, dict[str, gpd.GeoDataFrame]], output: GenPlannerOutputDTO
+    ) -> dict[str, dict[str, gpd.GeoDataFrame]]:
+        """
+        Function applies output options to each layer of each group of layers.
+        Args:
+            groups (dict[str, dict[str, gpd.GeoDataFrame]]): Layers by layer names, grouped by group names.
+            output (GenPlannerOutputDTO): Output precision, simplification and filtering options.
+        Returns:
+            dict[str, dict[str, gpd.GeoDataFrame]]: Layers with applied output options.
+        """
+
+        options = output.model_dump()
+        with timed_stage("output_options"):
+            return {
+                name: {layer: apply_output_options(gdf, **options) for layer, gdf in layers.items()}
+                for name, layers in groups.items()
+            }
+
+    @staticmethod
+    def encode_result(
+        layers: dict[str, gpd.GeoDataFrame], result_format: ResultFormat, content_encoding: ContentEncoding
+    ) -> bytes:
+        """
+        Function encodes layers to binary format and compresses them, GeoParquet is compressed internally.
+        Args:
+            layers (dict[str, gpd.GeoDataFrame]): Layers by names.
+            result_format (ResultFormat): Binary result format.
+            content_encoding (ContentEncoding): Result compression.
+        Returns:
+            bytes: Encoded result.
+        """
+
+        with timed_stage("serialization"):
+            content = encode_layers(layers, result_format)
+            if content_encoding != "identity" and result_format != "geoparquet":
+                content = b"".join(iter_compressed(iter([content]), content_encoding))
+        return content
+
+    async def form_genplanner_response(
+        self,
+        zones: gpd.GeoDataFrame,
+        roads: gpd.GeoDataFrame,
+        result_format: ResultFormat = "geojson",
+        content_encoding: ContentEncoding = "identity",
+        output: GenPlannerOutputDTO | None = None,
+    ) -> Response:
+        """
+        Function forms response in the requested format from the given roads and zones GeoDataFrames.
+        GeoJSON keeps GenPlannerResultSchema layout and is streamed by chunks of features,
+        binary formats hold both layers in one table with "layer" column.
+        GeoDataFrames are encoded straight to bytes in thread, skipping pydantic validation.
+        Args:
+            zones (gpd.GeoDataFrame): Zones GeoDataFrame.
+            roads (gpd.GeoDataFrame): Roads GeoDataFrame.
+            result_format (ResultFormat): Response format. Defaults to "geojson".
+            content_encoding (ContentEncoding): Response compression. Defaults to "identity".
+            output (GenPlannerOutputDTO | None): Output precision, simplification and filtering options.
+        Returns:
+            Response: Response with encoded result.
+        """
+
+        layers = {"zones": zones, "roads": roads}
+        if output and not output.is_default():
+            groups = await asyncio.to_thread(self.apply_groups_output_options, {"result": layers}, output)
+            layers = groups["result"]
+        headers = {"Vary": "Accept, Accept-Encoding"}
+        if result_format == "geojson":
+            if content_encoding != "identity":
+                headers["Content-Encoding"] = content_encoding
+            chunks = iter_compressed(iter_feature_collections(layers), content_encoding)
+            return StreamingResponse(
+                self.iter_in_thread(chunks), media_type=RESULT_MEDIA_TYPES["geojson"], headers=headers
+            )
+
+        headers["Content-Disposition"] = f'attachment; filename="genplanner.{RESULT_FILE_EXTENSIONS[result_format]}"'
+        if content_encoding != "identity" and result_format != "geoparquet":
+            headers["Content-Encoding"] = content_encoding
+        with trace_span("serialization", format=result_format, encoding=content_encoding) as span:
+            content = await asyncio.to_thread(self.encode_result, layers, result_format, content_encoding)
+            if span is not None:
+                span.set_attributes(bytes=len(content))
+        return Response(content=content, media_type=RESULT_MEDIA_TYPES[result_format], headers=headers)
+
+    async def form_genplanner_batch_response(
+        self,
+        results: dict[str, tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]],
+        content_encoding: ContentEncoding = "identity",
+        output: GenPlannerOutputDTO | None = None,
+    ) -> Response:
+        """
+        Function forms streamed GeoJSON response with GenPlannerResultSchema layout for each variant.
+        Args:
+            results (dict[str, tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]]): Generated zones and roads by variant names.
+            content_encoding (ContentEncoding): Response compression. Defaults to "identity".
+            output (GenPlannerOutputDTO | None): Output precision, simplification and filtering options.
+        Returns:
+            Response: Response with encoded results by variant names.
+        """
+
+        groups = {name: {"zones": zones, "roads": roads} for name, (zones, roads) in results.items()}
+        if output and not output.is_default():
+            groups = await asyncio.to_thread(self.apply_groups_output_options, groups, output)
+        headers = {"Vary": "Accept-Encoding"}
+        if content_encoding != "identity":
+            headers["Content-Encoding"] = content_encoding
+        chunks = iter_compressed(iter_grouped_feature_collections(groups), content_encoding)
+        return StreamingResponse(self.iter_in_thread(chunks), media_type=RESULT_MEDIA_TYPES["geojson"], headers=headers)
+
+    @staticmethod
+    async def log_request_params(
+        params: GenPlannerFuncZonesDTO | GenPlannerCustomDTO | GenPlannerBatchDTO, start: bool
+    ) -> None:
         """
         Function logs the request parameters for the generation.
         Args:
-            params (GenPlannerFuncZonesDTO): Parameters for the generation.
+            params (GenPlannerFuncZonesDTO | GenPlannerCustomDTO | GenPlannerBatchDTO): Parameters for the generation.
             start (bool): Flag indicating whether the generation is starting or completed.
         Returns:
             None
@@ -227,7 +726,7 @@ class GenPlannerService:
         token: str,
         config: Config,
         on_zones_only: bool = False,
-    ) -> GenPlannerResultSchema:
+    ) -> tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]:
         """
         Function runs the functional generation with the given parameters.
         Args:
@@ -235,44 +734,116 @@ class GenPlannerService:
             token (str): User bearer access token.
             on_zones_only
         Returns:
-            GenPlannerResultSchema: Result of the functional generation.
+            tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]: Generated zones and roads.
         """
 
         await self.log_request_params(params, True)
-        genplanner = await self.form_genplanner(
+        genplanner_params = await self.form_genplanner_params(
             params,
             token,
             config,
             on_zones_only,
         )
-        zones, roads = await asyncio.to_thread(
-            genplanner.features2terr_zones2blocks,
-            funczone=params._custom_func_zone,
-            fixed_terr_zones=params._fix_zones_gdf,
+        zones, roads = await self.generate_func_zones(params, genplanner_params, on_zones_only)
+        await self.log_request_params(params, False)
+        return zones, roads
+
+    async def generate_func_zones(
+        self, params: GenPlannerFuncZonesDTO, genplanner_params: dict[str, Any], on_zones_only: bool = False
+    ) -> tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]:
+        """
+        Function runs the functional generation with already formed GenPlanner initialization parameters.
+        Args:
+            params (GenPlannerFuncZonesDTO): Parameters for the functional generation.
+            genplanner_params (dict[str, Any]): GenPlanner initialization parameters.
+            on_zones_only (bool): Weather to generate only using requested zones.
+        Returns:
+            tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]: Generated zones and roads.
+        """
+
+        params_fingerprints = self.fingerprint_genplanner_params(genplanner_params)
+        cache_key = self.form_result_cache_key(
+            fingerprint_params(params.model_dump(mode="json")),
+            params_fingerprints,
+            on_zones_only,
+            fingerprint_gdf(params._initial_zones_to_add) if on_zones_only else None,
+        )
+        prepared_key = self.form_prepared_cache_key(
+            params_fingerprints,
+            params.project_id,
+            params.scenario_id,
+            params.elevation_angle,
+            params.functional_zones.model_dump_json() if params.functional_zones else None,
+            on_zones_only,
+        )
+        return await self.generate(
+            cache_key,
+            genplanner_params,
+            {"funczone": params._custom_func_zone, "fixed_terr_zones": params._fix_zones_gdf},
+            params._initial_zones_to_add if on_zones_only else None,
+            prepared_key,
         )
-        if on_zones_only:
-            zones = pd.concat([zones, params._initial_zones_to_add])
-        res = await self.form_genplanner_response(zones, roads)
+
+    async def run_batch_func_generation(
+        self,
+        params: GenPlannerBatchDTO,
+        token: str,
+        config: Config,
+        on_zones_only: bool = False,
+    ) -> dict[str, tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]]:
+        """
+        Function runs the functional generation for several variants on the same project and scenario.
+        Inputs are extracted and prepared once, variants are generated concurrently in executor.
+        Args:
+            params (GenPlannerBatchDTO): Shared and variants parameters.
+            token (str): User bearer access token.
+            config (Config): App config.
+            on_zones_only (bool): Weather to generate only using requested zones.
+        Returns:
+            dict[str, tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]]: Generated zones and roads by variant names.
+        """
+
+        await self.log_request_params(params, True)
+        variants = params._variants_params
+        first_variant = next(iter(variants.values()))
+        genplanner_params = await self.form_genplanner_params(first_variant, token, config, on_zones_only)
+        for variant in variants.values():
+            variant._territory_gdf = first_variant._territory_gdf
+            variant._initial_zones_to_add = first_variant._initial_zones_to_add
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                tasks = {
+                    name: task_group.create_task(self.generate_func_zones(variant, genplanner_params, on_zones_only))
+                    for name, variant in variants.items()
+                }
+        except ExceptionGroup as e:
+            raise e.exceptions[0]
         await self.log_request_params(params, False)
-        return GenPlannerResultSchema(**res)
+        return {name: task.result() for name, task in tasks.items()}
 
-    async def run_custom_func_generation(self, params: GenPlannerCustomDTO) -> GenPlannerResultSchema:
+    async def run_custom_func_generation(
+        self, params: GenPlannerCustomDTO
+    ) -> tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]:
         """
         Function runs the functional generation with the given parameters.
         Args:
             params (GenPlannerCustomDTO): Parameters for the functional generation.
         Returns:
-            GenPlannerResultSchema: Result of the functional generation.
+            tuple[gpd.GeoDataFrame, gpd.GeoDataFrame]: Generated zones and roads.
         """
 
         await self.log_request_params(params, True)
-        genplanner = await self.form_custom_genplanner(params)
-        zones, roads = await asyncio.to_thread(
-            genplanner.features2terr_zones2blocks,
-            funczone=params._func_zone,
+        genplanner_params = await self.form_custom_genplanner_params(params)
+        params_fingerprints = self.fingerprint_genplanner_params(genplanner_params)
+        cache_key = self.form_result_cache_key(
+            fingerprint_params({"profile_id": params.profile_id}), params_fingerprints
+        )
+        return await self.generate(
+            cache_key,
+            genplanner_params,
+            {"funczone": params._func_zone},
+            prepared_key=self.form_prepared_cache_key(params_fingerprints, "custom"),
         )
-        res = await self.form_genplanner_response(zones, roads)
-        return GenPlannerResultSchema(**res)
 
     # TODO revise for more convenient way later
     @staticmethod
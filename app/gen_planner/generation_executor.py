@@ -0,0 +1,175 @@
+import asyncio
+import multiprocessing
+import os
+import resource
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Literal
+
+from loguru import logger
+
+from app.common.metrics.metrics import collect_stage_timings, record_stage_timings
+from app.common.profiling.profiler import ProfilingSession, get_profiling_session, profile_call
+from app.common.tracing.tracer import trace_span
+
+
+def get_rss_bytes() -> int:
+    """
+    Function returns resident set size of current process.
+    Returns:
+        int: Current RSS in bytes, or peak RSS if /proc is not available.
+    """
+
+    try:
+        with open("/proc/self/statm", "r", encoding="utf-8") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _init_worker() -> None:
+    """
+    Function preloads heavy generation imports in worker process, so first job does not pay for them
+    """
+
+    import genplanner  # pylint: disable=import-outside-toplevel,unused-import
+
+    logger.info(f"Generation worker {os.getpid()} is ready")
+
+
+def _run_in_worker(func: Callable, *args: Any) -> tuple[Any, dict[str, float], int, int]:
+    """
+    Function runs job in worker process and reports its stages durations and worker memory usage after it.
+    Args:
+        func (Callable): Picklable function to run.
+        *args (Any): Picklable function arguments.
+    Returns:
+        tuple[Any, dict[str, float], int, int]: Function result, its stages durations, worker RSS in bytes and PID.
+    """
+
+    result, timings = collect_stage_timings(func, *args)
+    return result, timings, get_rss_bytes(), os.getpid()
+
+
+class GenerationExecutor:
+    """
+    Executor for CPU-bound generation jobs.
+    In "process" mode jobs run in a pool of worker processes with preloaded genplanner, so concurrent generations
+    don't compete for GIL of the app worker and event loop stays responsive.
+    Workers are recycled after max_tasks_per_worker jobs, and the whole pool is recycled when any worker exceeds
+    max_worker_rss_mb after a job, letting running jobs of old pool finish, or when a worker dies abruptly.
+    In "thread" mode jobs run in threads of the app worker process.
+    Durations of stages timed in jobs are recorded to app metrics in both modes.
+    Jobs of profiled requests run under sampling profiler, their sessions are added to request profiling.
+    Attributes:
+        mode (Literal["process", "thread"]): Execution mode.
+        workers (int): Number of simultaneously executed jobs.
+        max_tasks_per_worker (int): Number of jobs after which worker process is replaced.
+        max_worker_rss_mb (int): Worker RSS in MB after which process pool is replaced.
+        workers_rss (OrderedDict[int, int]): Last reported RSS in bytes of recently used worker processes by PID.
+    """
+
+    def __init__(
+        self,
+        mode: Literal["process", "thread"] = "process",
+        workers: int = 2,
+        max_tasks_per_worker: int = 20,
+        max_worker_rss_mb: int = 4096,
+    ):
+        """
+        Function initializes GenerationExecutor.
+        Args:
+            mode (Literal["process", "thread"]): Execution mode. Defaults to "process".
+            workers (int): Number of simultaneously executed jobs. Defaults to 2.
+            max_tasks_per_worker (int): Number of jobs after which worker process is replaced. Defaults to 20.
+            max_worker_rss_mb (int): Worker RSS in MB after which process pool is replaced. Defaults to 4096.
+        """
+
+        if mode not in ("process", "thread"):
+            raise ValueError(f"Unknown generation executor mode: {mode}")
+        self.mode = mode
+        self.workers = workers
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.max_worker_rss_mb = max_worker_rss_mb
+        self.workers_rss: OrderedDict[int, int] = OrderedDict()
+        self._executor: Executor = self._create_executor()
+
+    def _create_executor(self) -> Executor:
+
+        if self.mode == "thread":
+            return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="generation")
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            max_tasks_per_child=self.max_tasks_per_worker,
+        )
+
+    def _recycle(self) -> None:
+
+        old_executor = self._executor
+        self._executor = self._create_executor()
+        old_executor.shutdown(wait=False)
+        self.workers_rss.clear()
+        logger.info("Generation process pool recycled")
+
+    async def run(self, func: Callable, *args: Any) -> Any:
+        """
+        Function runs CPU-bound job in executor without blocking event loop.
+        Args:
+            func (Callable): Function to run, must be picklable module level function in "process" mode.
+            *args (Any): Function arguments, must be picklable in "process" mode.
+        Returns:
+            Any: Function result.
+        """
+
+        with trace_span(f"executor {func.__name__}", mode=self.mode) as span:
+            result, timings = await self._run(func, *args)
+            if span is not None:
+                span.set_attributes(**{f"stage.{stage}": duration for stage, duration in timings.items()})
+            return result
+
+    async def _run(self, func: Callable, *args: Any) -> tuple[Any, dict[str, float]]:
+
+        loop = asyncio.get_running_loop()
+        profiling = get_profiling_session()
+        if profiling is not None:
+            func, args = profile_call, (func, *args)
+        if self.mode == "thread":
+            result, timings = await loop.run_in_executor(self._executor, collect_stage_timings, func, *args)
+            record_stage_timings(timings)
+            return self._unwrap_profiled(result, profiling), timings
+        executor = self._executor
+        try:
+            result, timings, rss, pid = await loop.run_in_executor(executor, _run_in_worker, func, *args)
+        except BrokenProcessPool:
+            if executor is self._executor:
+                logger.error("Generation worker terminated abruptly, recycling pool")
+                self._recycle()
+            raise
+        record_stage_timings(timings)
+        self.workers_rss[pid] = rss
+        self.workers_rss.move_to_end(pid)
+        while len(self.workers_rss) > self.workers:
+            self.workers_rss.popitem(last=False)
+        if rss > self.max_worker_rss_mb * 1024 * 1024 and executor is self._executor:
+            logger.warning(f"Generation worker RSS {rss // (1024 * 1024)} MB exceeds limit, recycling pool")
+            self._recycle()
+        return self._unwrap_profiled(result, profiling), timings
+
+    @staticmethod
+    def _unwrap_profiled(result: Any, profiling: ProfilingSession | None) -> Any:
+
+        if profiling is None:
+            return result
+        result, session = result
+        profiling.add_worker_session(session)
+        return result
+
+    def close(self) -> None:
+        """
+        Function shuts executor down, cancelling queued jobs
+        """
+
+        self._executor.shutdown(wait=False, cancel_futures=True)
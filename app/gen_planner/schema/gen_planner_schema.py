@@ -1,3 +1,5 @@
+from typing import Any, Literal, Optional
+
 from pydantic import BaseModel, field_validator
 
 from app.common.geometries_dto.geometries import LineStringFeatureCollection, PolygonalFeatureCollection
@@ -7,6 +9,15 @@ class GenPlannerStartSchema(BaseModel):
     task_id: str
 
 
+class GenPlannerTaskStatusSchema(BaseModel):
+    task_id: str
+    status: Literal["queued", "running", "finished", "failed", "cancelled"]
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[dict[str, Any]] = None
+
+
 class GenPlannerResultSchema(BaseModel):
     zones: PolygonalFeatureCollection
     roads: LineStringFeatureCollection
@@ -3,15 +3,152 @@ from pathlib import Path
 from fastapi import FastAPI
 from iduconfig import Config
 from loguru import logger
+from prometheus_client import REGISTRY
 
 from app.clients.ecodonat_api_client import EcodonutApiClient
 from app.clients.urban_api_client import UrbanApiClient
+from app.common.admission.admission_controller import AdmissionController
 from app.common.api_handlers.json_api_handler import AsyncJsonApiHandler
+from app.common.caching.geodata_cache import GeoDataCache
+from app.common.caching.result_cache import GenerationResultCache
+from app.common.config.config_getter import get_config_value
+from app.common.jobs.job_manager import JobManager
 from app.common.logging.init_logger import init_logger
+from app.common.metrics.collector import AppMetricsCollector
+from app.common.profiling.profiler import ProfileStorage
+from app.common.tracing.tracer import JsonLinesSpanExporter, OtlpHttpSpanExporter, Tracer, set_tracer
 from app.gen_planner.gen_planner_service import GenPlannerService
+from app.gen_planner.generation_executor import GenerationExecutor
 from app.version import __version__ as version
 
 
+def init_geodata_cache(config: Config) -> GeoDataCache:
+    """
+    Function initializes upstream geodata cache with TTLs and size limit from config
+    Args:
+        config (Config): app config instance
+    Returns:
+        GeoDataCache: geodata cache instance
+    """
+
+    ttls = {
+        "territory": get_config_value(config, "GEODATA_CACHE_TTL_TERRITORY", 3600.0, float),
+        "physical_objects": get_config_value(config, "GEODATA_CACHE_TTL_PHYSICAL_OBJECTS", 600.0, float),
+        "functional_zones": get_config_value(config, "GEODATA_CACHE_TTL_FUNCTIONAL_ZONES", 300.0, float),
+        "slope_polygons": get_config_value(config, "GEODATA_CACHE_TTL_SLOPE_POLYGONS", 3600.0, float),
+    }
+    max_size_bytes = get_config_value(config, "GEODATA_CACHE_MAX_MB", 512, int) * 1024 * 1024
+    return GeoDataCache(ttls, max_size_bytes)
+
+
+def init_result_cache(config: Config) -> GenerationResultCache:
+    """
+    Function initializes generation result cache with memory and disk tiers limits from config
+    Args:
+        config (Config): app config instance
+    Returns:
+        GenerationResultCache: generation result cache instance
+    """
+
+    return GenerationResultCache(
+        memory_max_bytes=get_config_value(config, "RESULT_CACHE_MEMORY_MB", 256, int) * 1024 * 1024,
+        disk_path=Path().resolve().absolute() / get_config_value(config, "RESULT_CACHE_DIR", "result_cache"),
+        disk_max_bytes=get_config_value(config, "RESULT_CACHE_DISK_MB", 2048, int) * 1024 * 1024,
+    )
+
+
+def init_prepared_cache(config: Config) -> GenerationResultCache:
+    """
+    Function initializes in-memory cache of prepared GenPlanner state with size limit from config
+    Args:
+        config (Config): app config instance
+    Returns:
+        GenerationResultCache: prepared GenPlanner cache instance
+    """
+
+    return GenerationResultCache(
+        memory_max_bytes=get_config_value(config, "PREPARED_CACHE_MEMORY_MB", 256, int) * 1024 * 1024,
+        name="prepared genplanner",
+    )
+
+
+def init_admission_controller(config: Config) -> AdmissionController | None:
+    """
+    Function initializes admission controller for generations with limits from config
+    Args:
+        config (Config): app config instance
+    Returns:
+        AdmissionController | None: admission controller instance, None if ADMISSION_CAPACITY is 0
+    """
+
+    capacity = get_config_value(
+        config, "ADMISSION_CAPACITY", get_config_value(config, "GENERATION_WORKERS", 2, int), int
+    )
+    if capacity <= 0:
+        return None
+    return AdmissionController(
+        capacity=capacity,
+        max_queue_size=get_config_value(config, "ADMISSION_QUEUE_SIZE", 10, int),
+        queue_timeout=get_config_value(config, "ADMISSION_QUEUE_TIMEOUT", 60.0, float),
+        cost_area_km2=get_config_value(config, "ADMISSION_COST_AREA_KM2", 0.0, float),
+        cost_zones=get_config_value(config, "ADMISSION_COST_ZONES", 0, int),
+        default_retry_after=get_config_value(config, "ADMISSION_RETRY_AFTER", 30.0, float),
+    )
+
+
+def init_api_handler(config: Config, base_url_key: str) -> AsyncJsonApiHandler:
+    """
+    Function initializes pooled api handler for upstream with connection settings from config
+    Args:
+        config (Config): app config instance
+        base_url_key (str): config key with upstream base url
+    Returns:
+        AsyncJsonApiHandler: api handler instance
+    """
+
+    return AsyncJsonApiHandler(
+        config.get(base_url_key),
+        max_concurrent_requests=int(config.get("MAX_API_ASYNC_EXTRACTIONS")),
+        connection_limit=get_config_value(config, "API_CONNECTION_LIMIT", 100, int),
+        connection_limit_per_host=get_config_value(config, "API_CONNECTION_LIMIT_PER_HOST", 30, int),
+        keepalive_timeout=get_config_value(config, "API_KEEPALIVE_TIMEOUT", 30.0, float),
+        dns_cache_ttl=get_config_value(config, "API_DNS_CACHE_TTL", 300, int),
+        connect_timeout=get_config_value(config, "API_CONNECT_TIMEOUT", 10.0, float),
+        read_timeout=get_config_value(config, "API_READ_TIMEOUT", 300.0, float),
+        max_retries=get_config_value(config, "API_MAX_RETRIES", 2, int),
+        retry_backoff=get_config_value(config, "API_RETRY_BACKOFF", 0.2, float),
+        retry_backoff_max=get_config_value(config, "API_RETRY_BACKOFF_MAX", 5.0, float),
+        hedge_percentile=get_config_value(config, "API_HEDGE_PERCENTILE", 95.0, float),
+        hedge_min_samples=get_config_value(config, "API_HEDGE_MIN_SAMPLES", 20, int),
+    )
+
+
+def init_tracer(config: Config) -> Tracer | None:
+    """
+    Function initializes tracer with spans exporter selected by TRACING_EXPORTER from config
+    Args:
+        config (Config): app config instance
+    Returns:
+        Tracer | None: tracer instance, None if TRACING_EXPORTER is "none"
+    """
+
+    exporter_type = get_config_value(config, "TRACING_EXPORTER", "none")
+    if exporter_type == "jsonl":
+        exporter = JsonLinesSpanExporter(
+            Path().resolve().absolute() / get_config_value(config, "TRACING_JSONL_PATH", "traces.jsonl")
+        )
+    elif exporter_type == "otlp":
+        exporter = OtlpHttpSpanExporter(
+            config.get("TRACING_OTLP_ENDPOINT"),
+            get_config_value(config, "TRACING_SERVICE_NAME", "genplanner"),
+        )
+    elif exporter_type == "none":
+        return None
+    else:
+        raise ValueError(f"Unknown TRACING_EXPORTER {exporter_type}, expected none, jsonl or otlp")
+    return Tracer(exporter, flush_interval=get_config_value(config, "TRACING_FLUSH_INTERVAL", 5.0, float))
+
+
 async def init_dependencies(app: FastAPI):
     """
     Function to initialize dependencies in app state
@@ -28,12 +165,93 @@ async def init_dependencies(app: FastAPI):
     app.state.log_path = Path().resolve().absolute() / app.state.config.get("LOG_FILE")
     init_logger(app.state.log_path, app.state.config.get("LOG_LEVEL"))
 
+    # operator endpoints key, cache invalidation endpoints are disabled if ADMIN_KEY is not set
+    app.state.admin_key = get_config_value(app.state.config, "ADMIN_KEY", None)
+
+    # on-demand profiling initialization, disabled if PROFILING_KEY is not set
+    app.state.profiling_key = get_config_value(app.state.config, "PROFILING_KEY", None)
+    app.state.profile_storage = (
+        ProfileStorage(
+            Path().resolve().absolute() / get_config_value(app.state.config, "PROFILING_DIR", "profiles"),
+            get_config_value(app.state.config, "PROFILING_MAX_PROFILES", 50, int),
+        )
+        if app.state.profiling_key
+        else None
+    )
+
+    # tracing initialization, disabled if TRACING_EXPORTER is not set
+    app.state.tracer = init_tracer(app.state.config)
+    if app.state.tracer:
+        await app.state.tracer.start()
+    set_tracer(app.state.tracer)
+
+    # upstream requests deadline initialization, 0 disables default deadline
+    app.state.request_deadline = get_config_value(app.state.config, "REQUEST_DEADLINE", 900.0, float)
+
     # gen_planner_service initialisation
-    urban_api_handler = AsyncJsonApiHandler(app.state.config.get("URBAN_API"))
-    urban_api_client = UrbanApiClient(urban_api_handler, int(app.state.config.get("MAX_API_ASYNC_EXTRACTIONS")))
-    ecodonut_api_handler = AsyncJsonApiHandler(app.state.config.get("ECODONUT_API"))
-    ecodonut_api_client = EcodonutApiClient(
-        ecodonut_api_handler, int(app.state.config.get("MAX_API_ASYNC_EXTRACTIONS"))
+    app.state.geodata_cache = init_geodata_cache(app.state.config)
+    app.state.result_cache = init_result_cache(app.state.config)
+    app.state.prepared_cache = init_prepared_cache(app.state.config)
+    app.state.urban_api_handler = init_api_handler(app.state.config, "URBAN_API")
+    app.state.ecodonut_api_handler = init_api_handler(app.state.config, "ECODONUT_API")
+    await app.state.urban_api_handler.start()
+    await app.state.ecodonut_api_handler.start()
+    urban_api_client = UrbanApiClient(
+        app.state.urban_api_handler,
+        get_config_value(app.state.config, "URBAN_API_MULTI_TYPE_PARAM", None),
+        app.state.geodata_cache,
+    )
+    ecodonut_api_client = EcodonutApiClient(app.state.ecodonut_api_handler, app.state.geodata_cache)
+    app.state.admission_controller = init_admission_controller(app.state.config)
+    app.state.generation_executor = GenerationExecutor(
+        mode=get_config_value(app.state.config, "GENERATION_EXECUTOR", "process"),
+        workers=get_config_value(app.state.config, "GENERATION_WORKERS", 2, int),
+        max_tasks_per_worker=get_config_value(app.state.config, "GENERATION_WORKER_MAX_TASKS", 20, int),
+        max_worker_rss_mb=get_config_value(app.state.config, "GENERATION_WORKER_MAX_RSS_MB", 4096, int),
+    )
+    app.state.genplanner_service = GenPlannerService(
+        urban_api_client,
+        ecodonut_api_client,
+        app.state.result_cache,
+        app.state.generation_executor,
+        app.state.prepared_cache,
+        app.state.admission_controller,
+    )
+
+    # generation jobs initialization
+    app.state.job_manager = JobManager(
+        workers=get_config_value(app.state.config, "GENERATION_JOB_WORKERS", 2, int),
+        max_queue_size=get_config_value(app.state.config, "GENERATION_JOB_QUEUE_SIZE", 100, int),
+        result_ttl=get_config_value(app.state.config, "GENERATION_JOB_RESULT_TTL", 3600.0, float),
+        max_finished_jobs=get_config_value(app.state.config, "GENERATION_JOB_MAX_FINISHED", 100, int),
+    )
+    await app.state.job_manager.start()
+
+    # app state metrics initialization
+    app.state.metrics_collector = AppMetricsCollector(
+        app.state.genplanner_service,
+        app.state.generation_executor,
+        app.state.geodata_cache,
+        {"result": app.state.result_cache, "prepared": app.state.prepared_cache},
+        app.state.admission_controller,
     )
-    app.state.genplanner_service = GenPlannerService(urban_api_client, ecodonut_api_client)
+    REGISTRY.register(app.state.metrics_collector)
     logger.info("Initialized app dependencies")
+
+
+async def close_dependencies(app: FastAPI):
+    """
+    Function to release dependencies resources on app shutdown
+    Args:
+        app (FastAPI): FastAPI app instance
+    """
+
+    REGISTRY.unregister(app.state.metrics_collector)
+    await app.state.job_manager.close()
+    app.state.generation_executor.close()
+    await app.state.urban_api_handler.close()
+    await app.state.ecodonut_api_handler.close()
+    set_tracer(None)
+    if app.state.tracer:
+        await app.state.tracer.close()
+    logger.info("Closed app dependencies")
@@ -4,10 +4,16 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse
 
+from app.common.api_handlers.deadline import DeadlineMiddleware
 from app.common.exceptions.exception_handler import ExceptionHandlerMiddleware
+from app.common.profiling.profiler import ProfilingMiddleware
+from app.common.tracing.tracing_middleware import TracingMiddleware
 from app.gen_planner.gen_planner_controller import gen_planner_router
-from app.init_dependencies import init_dependencies
+from app.init_dependencies import close_dependencies, init_dependencies
+from app.system.cache_router import cache_router
 from app.system.logs_router import logs_router
+from app.system.metrics_router import metrics_router
+from app.system.profiles_router import profiles_router
 from app.version import __version__ as version
 
 
@@ -15,12 +21,15 @@ from app.version import __version__ as version
 async def lifespan(app: FastAPI):
     await init_dependencies(app)
     yield
+    await close_dependencies(app)
 
 
 app = FastAPI(lifespan=lifespan, title="GenPlanner", description="GenPlanner by DDonnyy api service", version=version)
 
 origins = ["*"]
 
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(DeadlineMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -29,6 +38,7 @@ app.add_middleware(
     allow_headers=["*"],
 )
 app.add_middleware(ExceptionHandlerMiddleware)
+app.add_middleware(TracingMiddleware)
 
 
 @app.get("/", response_model=dict[str, str])
@@ -36,5 +46,8 @@ def read_root():
     return RedirectResponse(url="/docs")
 
 
+app.include_router(metrics_router)
 app.include_router(logs_router, prefix="/genplanner")
+app.include_router(profiles_router, prefix="/genplanner")
+app.include_router(cache_router, prefix="/genplanner")
 app.include_router(gen_planner_router, prefix="/genplanner")
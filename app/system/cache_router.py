@@ -0,0 +1,80 @@
+from typing import Any, Literal, Optional
+
+from fastapi import APIRouter, Depends
+
+from app.common.auth.admin_key import verify_admin_key
+from app.common.caching.geodata_cache import GeoDataCache
+from app.common.caching.result_cache import GenerationResultCache
+from app.dependencies import get_geodata_cache, get_prepared_cache, get_result_cache
+
+cache_router = APIRouter(prefix="/cache", tags=["cache"])
+
+
+@cache_router.get("/geodata/stats", response_model=dict[str, Any])
+async def get_geodata_cache_stats(geodata_cache: GeoDataCache = Depends(get_geodata_cache)) -> dict[str, Any]:
+    """
+    Get upstream geodata cache size and hit/miss counters by source
+    """
+
+    return geodata_cache.stats()
+
+
+@cache_router.delete("/geodata", response_model=dict[str, int], dependencies=[Depends(verify_admin_key)])
+async def invalidate_geodata_cache(
+    source: Optional[Literal["territory", "physical_objects", "functional_zones", "slope_polygons"]] = None,
+    project_id: Optional[int] = None,
+    scenario_id: Optional[int] = None,
+    geodata_cache: GeoDataCache = Depends(get_geodata_cache),
+) -> dict[str, int]:
+    """
+    Invalidate upstream geodata cache entries. Without filters whole cache is cleared. Requires X-Admin-Key header.
+    Project entries are territories and slope polygons, scenario entries are physical objects and functional zones.
+    """
+
+    if project_id is not None:
+        removed = geodata_cache.invalidate(source, "project", project_id)
+    elif scenario_id is not None:
+        removed = geodata_cache.invalidate(source, "scenario", scenario_id)
+    else:
+        removed = geodata_cache.invalidate(source)
+    return {"removed": removed}
+
+
+@cache_router.get("/results/stats", response_model=dict[str, Any])
+async def get_result_cache_stats(result_cache: GenerationResultCache = Depends(get_result_cache)) -> dict[str, Any]:
+    """
+    Get generation result cache size and hit/miss counters by tier
+    """
+
+    return result_cache.stats()
+
+
+@cache_router.delete("/results", response_model=dict[str, int], dependencies=[Depends(verify_admin_key)])
+async def clear_result_cache(result_cache: GenerationResultCache = Depends(get_result_cache)) -> dict[str, int]:
+    """
+    Clear generation result cache in memory and on disk. Requires X-Admin-Key header.
+    """
+
+    return {"removed": result_cache.clear()}
+
+
+@cache_router.get("/prepared/stats", response_model=dict[str, Any])
+async def get_prepared_cache_stats(
+    prepared_cache: GenerationResultCache = Depends(get_prepared_cache),
+) -> dict[str, Any]:
+    """
+    Get prepared GenPlanner state cache size and hit/miss counters
+    """
+
+    return prepared_cache.stats()
+
+
+@cache_router.delete("/prepared", response_model=dict[str, int], dependencies=[Depends(verify_admin_key)])
+async def clear_prepared_cache(
+    prepared_cache: GenerationResultCache = Depends(get_prepared_cache),
+) -> dict[str, int]:
+    """
+    Clear prepared GenPlanner state cache. Requires X-Admin-Key header.
+    """
+
+    return {"removed": prepared_cache.clear()}
@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+
+metrics_router = APIRouter(tags=["metrics"])
+
+
+@metrics_router.get("/metrics", response_class=Response)
+async def get_metrics() -> Response:
+    """
+    Get app metrics in Prometheus text format: stages and upstream requests durations histograms,
+    running and queued generations, caches hit ratios and workers memory
+    """
+
+    return Response(content=generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,40 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import HTMLResponse, Response
+
+from app.common.profiling.profiler import ProfileStorage, ReportFormat, verify_profile_key
+from app.dependencies import get_profile_storage
+
+profiles_router = APIRouter(prefix="/profiles", tags=["profiles"], dependencies=[Depends(verify_profile_key)])
+
+
+@profiles_router.get("", response_model=list[dict[str, Any]])
+async def get_profiles(profile_storage: ProfileStorage = Depends(get_profile_storage)) -> list[dict[str, Any]]:
+    """
+    Get stored profiles of requests sent with X-Profile-Key header, from newest to oldest
+    """
+
+    return profile_storage.list()
+
+
+@profiles_router.get("/{profile_id}/{session_name}", response_class=Response)
+async def get_profile_report(
+    profile_id: str,
+    session_name: str,
+    report_format: ReportFormat = Query("html", alias="format"),
+    profile_storage: ProfileStorage = Depends(get_profile_storage),
+) -> Response:
+    """
+    Get profile session report: "request" session is recorded in event loop, "worker-{i}" sessions in generation
+    workers. "html" format holds call tree and timeline, "speedscope" is a flamegraph for speedscope.app
+    """
+
+    report = profile_storage.render(profile_id, session_name, report_format)
+    if report_format == "html":
+        return HTMLResponse(report)
+    return Response(
+        content=report,
+        media_type="application/json",
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}-{session_name}.speedscope.json"'},
+    )